@@ -0,0 +1,209 @@
+# ================================================================
+#  Big Five — API HTTP local de puntuación e informes
+#  asyncio para las conexiones + pool de procesos para el trabajo CPU
+#  Uso: python api_server.py --port 8502 --workers 4 --max-batch 500
+# ================================================================
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from bigfive import (
+    HAS_MPL, DIM_LIST, DIMENSIONES, QUESTIONS, KEY2IDX, LIK_KEYS,
+    answers_matrix, compute_scores_batch, level_label, dimension_profile,
+    build_pdf, build_html,
+)
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+REASONS = {200:"OK", 400:"Bad Request", 404:"Not Found", 405:"Method Not Allowed",
+           411:"Length Required", 413:"Payload Too Large", 500:"Internal Server Error"}
+
+class ApiError(Exception):
+    def __init__(self, status:int, message:str):
+        super().__init__(message)
+        self.status = status
+
+# ---------------------------------------------------------------
+# Trabajo CPU (se ejecuta en los procesos del pool; debe ser picklable)
+# ---------------------------------------------------------------
+def score_batch(answer_sets:list, with_profile:bool=True)->list:
+    scores = compute_scores_batch(answers_matrix(answer_sets))
+    out = []
+    for row in scores:
+        res = {d: float(v) for d, v in zip(DIM_LIST, row)}
+        item = {"scores": res, "levels": {}}
+        if with_profile: item["profiles"] = {}
+        for d, score in res.items():
+            lvl, tag = level_label(score)
+            item["levels"][d] = {"code": DIMENSIONES[d]["code"], "nivel": lvl, "etiqueta": tag}
+            if with_profile:
+                f, r, recs, roles, not_apt, expl = dimension_profile(d, score)
+                item["profiles"][d] = {"fortalezas": f, "riesgos": r, "recomendaciones": recs,
+                                       "roles": roles, "no_recomendado": not_apt, "explicativo": expl}
+        out.append(item)
+    return out
+
+def render_report(answers:dict, fecha:str, fmt:str)->bytes:
+    res = {d: float(v) for d, v in zip(DIM_LIST, compute_scores_batch(answers_matrix([answers]))[0])}
+    return build_pdf(res, fecha) if fmt == "pdf" else build_html(res, fecha)
+
+# ---------------------------------------------------------------
+# Validación (barata: se hace en el event loop)
+# ---------------------------------------------------------------
+def validate_answers(answers)->dict:
+    if not isinstance(answers, dict):
+        raise ApiError(400, "Cada conjunto de respuestas debe ser un objeto {clave: 1..5}.")
+    for k, v in answers.items():
+        if k not in KEY2IDX:
+            raise ApiError(400, f"Clave de ítem desconocida: {k}")
+        if v is not None and (isinstance(v, bool) or v not in LIK_KEYS):
+            raise ApiError(400, f"Valor fuera de escala para {k}: {v!r}")
+    return answers
+
+def parse_answer_sets(payload, max_batch:int):
+    """Acepta {"answers": {...}}, {"batch": [...]} o una lista; devuelve (lista, es_lote)."""
+    if isinstance(payload, list):
+        sets, is_batch = payload, True
+    elif isinstance(payload, dict) and "batch" in payload:
+        sets, is_batch = payload["batch"], True
+    elif isinstance(payload, dict) and "answers" in payload:
+        sets, is_batch = [payload["answers"]], False
+    else:
+        raise ApiError(400, "Se espera {'answers': {...}}, {'batch': [...]} o una lista.")
+    if not isinstance(sets, list) or not sets:
+        raise ApiError(400, "El lote debe ser una lista no vacía.")
+    if len(sets) > max_batch:
+        raise ApiError(413, f"Lote de {len(sets)} excede el máximo configurado ({max_batch}).")
+    return [validate_answers(a) for a in sets], is_batch
+
+def flag(query:dict, name:str, default:bool)->bool:
+    vals = query.get(name)
+    return default if not vals else vals[-1].lower() not in ("0", "false", "no")
+
+# ---------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------
+class ScoringServer:
+    def __init__(self, workers:int, max_batch:int):
+        self.max_batch = max_batch
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    async def route(self, method:str, target:str, body:bytes):
+        url = urlsplit(target); query = parse_qs(url.query)
+        loop = asyncio.get_running_loop()
+        if url.path == "/health":
+            if method != "GET": raise ApiError(405, "Usa GET.")
+            return 200, "application/json", {"status": "ok", "workers": self.workers,
+                                             "max_batch": self.max_batch, "items": len(QUESTIONS),
+                                             "pdf": HAS_MPL}
+        if url.path not in ("/score", "/report"):
+            raise ApiError(404, f"Ruta no encontrada: {url.path}")
+        if method != "POST": raise ApiError(405, "Usa POST con un cuerpo JSON.")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise ApiError(400, "JSON inválido.")
+
+        if url.path == "/score":
+            sets, is_batch = parse_answer_sets(payload, self.max_batch)
+            results = await loop.run_in_executor(self.pool, score_batch, sets,
+                                                 flag(query, "profile", True))
+            return 200, "application/json", ({"results": results} if is_batch else results[0])
+
+        # /report: un solo conjunto de respuestas -> PDF (si hay matplotlib) o HTML
+        if isinstance(payload, list) or (isinstance(payload, dict) and "batch" in payload):
+            raise ApiError(400, "/report genera un informe por petición: envía un solo {'answers': {...}}.")
+        sets, _ = parse_answer_sets(payload, self.max_batch)
+        fmt = (query.get("format") or ["pdf" if HAS_MPL else "html"])[-1]
+        if fmt not in ("pdf", "html"): raise ApiError(400, "format debe ser pdf o html.")
+        if fmt == "pdf" and not HAS_MPL: raise ApiError(400, "PDF no disponible: instala matplotlib.")
+        fecha = payload.get("fecha", "") if isinstance(payload, dict) else ""
+        data = await loop.run_in_executor(self.pool, render_report, sets[0], str(fecha), fmt)
+        return 200, ("application/pdf" if fmt == "pdf" else "text/html; charset=utf-8"), data
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""): break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                try:
+                    # Sin un largo válido no se sabe dónde acaba el cuerpo: se responde y se cierra
+                    if "transfer-encoding" in headers:
+                        keep_alive = False
+                        raise ApiError(411, "Transfer-Encoding no soportado: envía Content-Length.")
+                    try:
+                        length = int(headers.get("content-length", "0"))
+                        if length < 0: raise ValueError(length)
+                    except ValueError:
+                        keep_alive = False
+                        raise ApiError(400, "Content-Length inválido.")
+                    if length > MAX_BODY_BYTES: raise ApiError(413, "Cuerpo demasiado grande.")
+                    body = await reader.readexactly(length) if length else b""
+                    status, ctype, data = await self.route(method.upper(), target, body)
+                except ApiError as e:
+                    status, ctype, data = e.status, "application/json", {"error": str(e)}
+                    keep_alive = keep_alive and e.status != 413
+                except Exception as e:  # noqa: BLE001 — el servidor no debe caer por una petición
+                    status, ctype, data = 500, "application/json", {"error": f"{type(e).__name__}: {e}"}
+                if not isinstance(data, bytes):
+                    data = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                writer.write((f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                              f"Content-Type: {ctype}\r\nContent-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                              ).encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive: break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host:str, port:int):
+        # Arrancar los procesos del pool ANTES de abrir el socket: así no heredan
+        # el descriptor de escucha y la primera petición no paga los imports.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, score_batch, [{}], False)
+                               for _ in range(self.workers)])
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"API Big Five en http://{host}:{port} · workers={self.workers} · max_batch={self.max_batch}",
+              flush=True)
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows
+                pass
+        async with server:
+            await stop.wait()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="API HTTP local de puntuación Big Five.")
+    ap.add_argument("--host", default=os.environ.get("BIGFIVE_API_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("BIGFIVE_API_PORT", "8502")))
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("BIGFIVE_API_WORKERS", os.cpu_count() or 1)))
+    ap.add_argument("--max-batch", type=int, default=int(os.environ.get("BIGFIVE_API_MAX_BATCH", "500")))
+    args = ap.parse_args(argv)
+    srv = ScoringServer(workers=args.workers, max_batch=args.max_batch)
+    try:
+        asyncio.run(srv.serve(args.host, args.port))
+    finally:
+        srv.pool.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    main()
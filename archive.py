@@ -0,0 +1,216 @@
+# ================================================================
+#  Big Five — Archivo columnar de respuestas (memmap de NumPy)
+#  Un directorio por archivo: columnas binarias de ancho fijo que se
+#  abren con np.memmap (sin cargarlas en RAM) y una cabecera JSON con
+#  el instrumento, el orden de los ítems y el número de filas válidas.
+#  Uso: python archive.py import data/resultados.jsonl data/archivo
+#       python archive.py info data/archivo
+#       python archive.py bench 10000000 /tmp/archivo
+# ================================================================
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from bigfive import BUILTIN, Instrument
+from cohort import iter_results
+
+ARCHIVE_FORMAT = 1
+HEADER = "cabecera.json"
+CHUNK = 100_000  # filas por bloque al importar / re-puntuar
+
+def _columns(inst:Instrument)->dict:
+    """{nombre: (archivo, dtype, forma de una fila)}."""
+    return {
+        "answers": ("answers.i8", np.dtype(np.int8), (len(inst.questions),)),
+        "scores": ("scores.f32", np.dtype(np.float32), (len(inst.dim_list),)),
+        "ts": ("ts.dt64", np.dtype("datetime64[s]"), ()),
+        "ids": ("ids.u8", np.dtype(np.uint8), (16,)),  # uuid de 128 bits
+    }
+
+def encode_ids(ids)->np.ndarray:
+    """ids hex de 32 caracteres (uuid4().hex) -> (N × 16) uint8."""
+    return np.frombuffer(b"".join(bytes.fromhex(i) for i in ids), dtype=np.uint8).reshape(-1, 16)
+
+def new_ids(k:int)->np.ndarray:
+    """k uuid4 aleatorios ya codificados (equivale a uuid4().hex, sin un objeto por fila)."""
+    b = np.frombuffer(os.urandom(16 * k), dtype=np.uint8).reshape(k, 16).copy()
+    b[:, 6] = (b[:, 6] & 0x0F) | 0x40  # versión 4
+    b[:, 8] = (b[:, 8] & 0x3F) | 0x80  # variante RFC 4122
+    return b
+
+def decode_id(row:np.ndarray)->str:
+    return row.tobytes().hex()
+
+def _write_header(path:str, header:dict):
+    tmp = os.path.join(path, HEADER + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(header, fh, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(path, HEADER))
+
+class ResponseArchive:
+    """Evaluaciones completadas en columnas de ancho fijo.
+
+    `answers` (N × ítems, int8, 0 = sin respuesta), `scores` (N × dimensiones, float32),
+    `ts` (datetime64[s]) e `ids` (N × 16 bytes) son memmaps de solo lectura: abrir un
+    archivo de decenas de millones de filas solo lee la cabecera y cualquier slice es
+    una vista sin copia. `append` escribe al final de cada columna y actualiza el
+    recuento de filas en la cabecera al terminar; filas escritas a medias se descartan.
+    """
+    def __init__(self, path:str):
+        self.path = path
+        with open(os.path.join(path, HEADER), encoding="utf-8") as fh:
+            self.header = json.load(fh)
+        if self.header.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"{path}: formato de archivo no soportado: {self.header.get('format')}")
+        self.keys = self.header["keys"]
+        self.n = self.header["rows"]
+        self._maps = {}
+
+    @classmethod
+    def create(cls, path:str, inst:Instrument=BUILTIN):
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, HEADER)): raise FileExistsError(f"{path}: ya existe un archivo")
+        header = {"format": ARCHIVE_FORMAT, "instrument": inst.key, "content_hash": inst.content_hash,
+                  "keys": [q["key"] for q in inst.questions], "dims": [inst.dims[d]["code"] for d in inst.dim_list],
+                  "scale": [inst.lo, inst.hi], "rows": 0,
+                  "columns": {name: {"file": f, "dtype": dt.str, "row_shape": list(shape)}
+                              for name, (f, dt, shape) in _columns(inst).items()}}
+        for f, _, _ in _columns(inst).values():
+            open(os.path.join(path, f), "wb").close()
+        _write_header(path, header)
+        return cls(path)
+
+    @classmethod
+    def open_or_create(cls, path:str, inst:Instrument=BUILTIN):
+        return cls(path) if os.path.exists(os.path.join(path, HEADER)) else cls.create(path, inst)
+
+    def _column(self, name:str):
+        c = self.header["columns"][name]
+        return os.path.join(self.path, c["file"]), np.dtype(c["dtype"]), tuple(c["row_shape"])
+
+    def __len__(self)->int:
+        return self.n
+
+    def column(self, name:str)->np.ndarray:
+        """Memmap de solo lectura de una columna (N filas válidas)."""
+        m = self._maps.get(name)
+        if m is None or len(m) != self.n:
+            path, dt, shape = self._column(name)
+            if self.n == 0: return np.empty((0, *shape), dtype=dt)
+            m = self._maps[name] = np.memmap(path, dtype=dt, mode="r", shape=(self.n, *shape))
+        return m
+
+    answers = property(lambda self: self.column("answers"))
+    scores = property(lambda self: self.column("scores"))
+    ts = property(lambda self: self.column("ts"))
+    ids = property(lambda self: self.column("ids"))
+
+    def row(self, i:int)->dict:
+        return {"id": decode_id(self.ids[i]), "ts": str(self.ts[i]),
+                "answers": {k: int(v) or None for k, v in zip(self.keys, self.answers[i])},
+                "scores": dict(zip(self.header["dims"], (round(float(v), 1) for v in self.scores[i])))}
+
+    def check_instrument(self, inst:Instrument):
+        """Error si el orden de ítems del archivo no coincide con el del instrumento."""
+        if self.keys != [q["key"] for q in inst.questions]:
+            raise ValueError(f"{self.path}: el orden de ítems no coincide con {inst.key}")
+
+    # -----------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------
+    def append(self, answers:np.ndarray, scores:np.ndarray|None=None, ts=None, ids=None,
+               inst:Instrument=BUILTIN):
+        """Añade filas. Sin `scores` se calculan con `inst`; sin `ts`/`ids` se generan."""
+        answers = np.ascontiguousarray(answers, dtype=np.int8).reshape(-1, len(self.keys))
+        k = len(answers)
+        if k == 0: return
+        if scores is None:
+            self.check_instrument(inst)
+            scores = inst.compute_scores_batch(answers)
+        now = np.datetime64(int(time.time()), "s")
+        data = {
+            "answers": answers,
+            "scores": np.asarray(scores, dtype=np.float32).reshape(k, -1),
+            "ts": np.full(k, now) if ts is None else np.asarray(ts, dtype="datetime64[s]").reshape(k),
+            "ids": new_ids(k) if ids is None else encode_ids(ids),
+        }
+        self._maps.clear()
+        for name, arr in data.items():
+            path, dt, shape = self._column(name)
+            row_bytes = dt.itemsize * int(np.prod(shape, dtype=np.int64))
+            with open(path, "r+b") as fh:
+                fh.truncate(self.n * row_bytes)  # descarta restos de un append interrumpido
+                fh.seek(self.n * row_bytes)
+                fh.write(np.ascontiguousarray(arr, dtype=dt).tobytes())
+        self.n += k
+        self.header["rows"] = self.n
+        _write_header(self.path, self.header)
+
+    def import_results(self, results_path:str, inst:Instrument=BUILTIN)->int:
+        """Añade por bloques las filas nuevas del JSONL de resultados (ver cohort.CohortStore).
+
+        El offset ya importado queda en la cabecera: repetir la importación solo trae lo nuevo.
+        """
+        self.check_instrument(inst)
+        offset = self.header.get("imported", {}).get(os.path.abspath(results_path), 0)
+        added, rows = 0, []
+        def flush():
+            answers = inst.answers_matrix([r["answers"] for r in rows])
+            scores = [[r["scores"][d] for d in inst.dim_list] for r in rows]
+            self.header.setdefault("imported", {})[os.path.abspath(results_path)] = offset
+            self.append(answers, scores, ts=[r["ts"] for r in rows], ids=[r["id"] for r in rows])
+        for row, offset in iter_results(results_path, offset, instrumento=inst.key):
+            rows.append(row)
+            if len(rows) == CHUNK:
+                flush(); added += len(rows); rows = []
+        if rows:
+            flush(); added += len(rows)
+        return added
+
+    def rescore(self, inst:Instrument=BUILTIN)->np.ndarray:
+        """Vuelve a puntuar todas las respuestas por bloques (p. ej. tras cambiar el instrumento)."""
+        self.check_instrument(inst)
+        out = np.empty((self.n, len(inst.dim_list)), dtype=np.float32)
+        A = self.answers
+        for a in range(0, self.n, CHUNK):
+            out[a:a + CHUNK] = inst.compute_scores_batch(A[a:a + CHUNK])
+        return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Archivo columnar de evaluaciones Big Five.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    im = sub.add_parser("import"); im.add_argument("results"); im.add_argument("path")
+    sub.add_parser("info").add_argument("path")
+    b = sub.add_parser("bench", help="Escribe N filas sintéticas y mide la apertura")
+    b.add_argument("n", type=int); b.add_argument("path")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "import":
+        arc = ResponseArchive.open_or_create(args.path)
+        print(f"{arc.import_results(args.results):,} filas importadas · total {len(arc):,}")
+        return
+    if args.cmd == "bench":
+        rng = np.random.default_rng(0)
+        arc = ResponseArchive.open_or_create(args.path)
+        t0 = time.perf_counter()
+        for a in range(0, args.n, CHUNK):
+            arc.append(rng.integers(1, 6, (min(CHUNK, args.n - a), len(arc.keys)), dtype=np.int8))
+        print(f"{args.n:,} filas añadidas en {time.perf_counter()-t0:.1f} s")
+        t0 = time.perf_counter()
+        arc = ResponseArchive(args.path)
+        s = arc.scores[len(arc) // 2: len(arc) // 2 + 1000]
+        print(f"apertura + slice de 1000 filas: {(time.perf_counter()-t0)*1000:.2f} ms "
+              f"({len(arc):,} filas, media C={float(s[:, 1].mean()):.1f})")
+        return
+    arc = ResponseArchive(args.path)
+    h = arc.header
+    print(f"{arc.path}: {len(arc):,} filas · {h['instrument']} · {len(arc.keys)} ítems · {' '.join(h['dims'])}")
+    if len(arc):
+        print(f"desde {arc.ts[0]} hasta {arc.ts[-1]}")
+        print("medias: " + " ".join(f"{c}={v:.1f}" for c, v in zip(h["dims"], arc.scores.mean(axis=0))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# ================================================================
+#  Big Five — Benchmark de throughput de la API local (req/s)
+#  Uso: python bench_api.py --spawn --requests 2000 --concurrency 32
+#       python bench_api.py --url http://127.0.0.1:8502 --batch 100
+# ================================================================
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from bigfive import QUESTIONS
+
+def random_answers(rng)->dict:
+    return {q["key"]: int(v) for q, v in zip(QUESTIONS, rng.integers(1, 6, len(QUESTIONS)))}
+
+async def post(reader, writer, host:str, path:str, body:bytes):
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""): break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.lower() == "content-length": length = int(v)
+    await reader.readexactly(length)
+    return status
+
+async def client(host, port, path, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while bodies:
+            body = bodies.pop()
+            t0 = time.perf_counter()
+            if await post(reader, writer, host, path, body) != 200: errors.append(1)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+async def wait_ready(host, port, proc=None, timeout=30.0):
+    t_end = time.monotonic() + timeout
+    while time.monotonic() < t_end:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"api_server.py terminó con código {proc.returncode}")
+        try:
+            _, w = await asyncio.open_connection(host, port); w.close(); return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"La API no respondió en {host}:{port}")
+
+async def run(args, proc=None):
+    url = urlsplit(args.url); host, port = url.hostname, url.port or 80
+    await wait_ready(host, port, proc)
+    rng = np.random.default_rng(args.seed)
+    if args.endpoint == "report":
+        path = f"/report?format={args.format}"
+        make = lambda: {"answers": random_answers(rng), "fecha": "bench"}
+    else:
+        path = "/score" + ("" if args.profile else "?profile=0")
+        make = ((lambda: {"batch": [random_answers(rng) for _ in range(args.batch)]}) if args.batch > 1
+                else (lambda: {"answers": random_answers(rng)}))
+    bodies = [json.dumps(make()).encode("utf-8") for _ in range(args.requests)]
+
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*[client(host, port, path, bodies, latencies, errors)
+                           for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - t0
+    lat = np.array(latencies) * 1000
+    per = args.batch if args.endpoint == "score" else 1
+    print(f"{args.endpoint} · {args.requests} req · concurrencia={args.concurrency} · lote={per}")
+    print(f"  {args.requests/elapsed:,.1f} req/s · {args.requests*per/elapsed:,.1f} evaluaciones/s · errores={len(errors)}")
+    print(f"  latencia ms: p50={np.percentile(lat,50):.2f} p95={np.percentile(lat,95):.2f} max={lat.max():.2f}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de throughput de api_server.py")
+    ap.add_argument("--url", default="http://127.0.0.1:8502")
+    ap.add_argument("--endpoint", choices=["score", "report"], default="score")
+    ap.add_argument("--format", choices=["pdf", "html"], default="pdf")
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--batch", type=int, default=1)
+    ap.add_argument("--profile", type=int, default=1, help="0 = sin narrativas dimension_profile")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--spawn", action="store_true", help="Levanta api_server.py durante el benchmark")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        url = urlsplit(args.url)
+        cmd = [sys.executable, "api_server.py", "--host", url.hostname, "--port", str(url.port or 80),
+               "--max-batch", str(max(args.batch, 1))]
+        if args.workers: cmd += ["--workers", str(args.workers)]
+        proc = subprocess.Popen(cmd)
+    try:
+        asyncio.run(run(args, proc))
+    finally:
+        if proc:
+            proc.terminate(); proc.wait()
+
+if __name__ == "__main__":
+    main()
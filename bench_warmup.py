@@ -0,0 +1,66 @@
+# ================================================================
+#  Big Five — Primera vista de resultados con y sin precalentamiento
+#  Cada medición es un proceso nuevo: se completa el test con AppTest,
+#  se toma view_resultados tras el ítem final y luego la misma vista
+#  en caliente; la diferencia es el costo de arranque.
+#  Uso: python bench_warmup.py --rounds 5
+# ================================================================
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+def child(pause:float):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    at.button[0].click().run()
+    n = 0
+    while True:
+        last = at.session_state.q_idx == len(at.session_state.answers) - 1
+        if last:
+            time.sleep(pause)  # el candidato tarda en responder el último ítem
+            t0 = time.perf_counter()
+        at.radio[0].set_value((n % 5) + 1).run(); n += 1
+        if last: break
+    if at.exception or at.session_state.stage != "resultados": raise SystemExit(f"fallo: {at.exception}")
+    out = {"click": (time.perf_counter() - t0) * 1000, "first": at.session_state._t_vista_ms}
+    # Misma vista ya en caliente (forzando a regenerar el informe): la diferencia es el costo de arranque
+    at.session_state["_informe"] = None; del at.session_state["_t_vista_ms"]
+    at.run()
+    print(json.dumps({**out, "steady": at.session_state._t_vista_ms}))
+
+def measure(mode:str, pause:float)->dict:
+    env = {**os.environ, "BIGFIVE_WARMUP": mode, "BIGFIVE_DATA_DIR": tempfile.mkdtemp(),
+           "BIGFIVE_PAYLOAD_DIR": tempfile.mkdtemp()}
+    out = subprocess.run([sys.executable, __file__, "--child", "--pause", str(pause)], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Primera vista de resultados: proceso frío vs precalentado.")
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--pause", type=float, default=1.0, help="Segundos antes de responder el último ítem")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        child(args.pause); return
+
+    times = {"off": [], "test": []}
+    for _ in range(args.rounds):
+        for mode in times:  # alternados para repartir el ruido de la máquina
+            times[mode].append(measure(mode, args.pause))
+    print(f"{'':16s} {'click final':>12s} {'1ª vista':>9s} {'en caliente':>12s} {'sobrecosto':>11s}  (medianas, ms)")
+    for mode, label in (("off", "sin precalentar"), ("test", "precalentado")):
+        col = {k: np.array([t[k] for t in times[mode]]) for k in ("click", "first", "steady")}
+        print(f"{label:16s} {np.median(col['click']):12.0f} {np.median(col['first']):9.0f} "
+              f"{np.median(col['steady']):12.0f} {np.median(col['first'] - col['steady']):11.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,603 @@
+# ================================================================
+#  Big Five (OCEAN) — Núcleo del instrumento
+#  Ítems, narrativas, cálculo de puntuaciones e informes PDF/HTML.
+#  Sin dependencias de Streamlit: lo usan la app y la API local.
+# ================================================================
+import numpy as np
+from bisect import bisect_right
+from html import escape
+from io import BytesIO
+
+# Intento usar matplotlib (para PDF). Si no está, fallback a HTML.
+HAS_MPL = False
+try:
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.patches import FancyBboxPatch, Wedge, Circle
+    HAS_MPL = True
+except Exception:
+    HAS_MPL = False
+
+# ---------------------------------------------------------------
+# Definiciones Big Five
+# ---------------------------------------------------------------
+def reverse_score(v:int)->int: return 6 - v
+
+# Paleta por dimensión
+DIMENSIONES = {
+    "Apertura a la Experiencia": {
+        "code":"O", "icon":"",
+        "desc":"Curiosidad intelectual, creatividad y apertura al cambio.",
+        "color":"#8FB996",
+        "fort_high":[
+            "Genera ideas originales y puentes entre conceptos.",
+            "Explora nuevas metodologías con aprendizaje rápido.",
+            "Promueve mejora continua y experimentación controlada.",
+        ],
+        "risk_high":[
+            "Puede dispersarse en demasiadas líneas de trabajo.",
+            "Riesgo de sobre-innovar sin consolidar procesos.",
+            "Tendencia a aburrirse con tareas repetitivas.",
+        ],
+        "fort_low":[
+            "Constancia y apego a estándares probados.",
+            "Ejecución confiable en entornos estables.",
+        ],
+        "risk_low":[
+            "Resistencia al cambio y menor exploración conceptual.",
+            "Más dificultad para innovar en ambigüedad.",
+        ],
+        "recs_low":[
+            "Implementar micro-experimentos quincenales de 1h.",
+            "Exposición breve a nuevas herramientas (demo/POC).",
+        ],
+        "roles_high":["Innovación","I+D","Diseño","Estrategia","Consultoría"],
+        "roles_low":["Operaciones estandarizadas","Control de calidad"],
+        "no_apt_high":["Cargos ultra-rutinarios sin espacio creativo"],
+        "no_apt_low":["Laboratorios de innovación, estrategia corporativa"]
+    },
+    "Responsabilidad": {
+        "code":"C", "icon":"",
+        "desc":"Orden, planificación, disciplina y cumplimiento de objetivos.",
+        "color":"#A1C3D1",
+        "fort_high":[
+            "Fiabilidad en plazos y calidad del entregable.",
+            "Excelente gestión del tiempo y priorización.",
+            "Documentación y control de procesos destacables.",
+        ],
+        "risk_high":[
+            "Perfeccionismo que retrasa entregas.",
+            "Rigidez ante cambios de última hora.",
+        ],
+        "fort_low":[
+            "Flexibilidad y adaptación rápida a imprevistos.",
+            "Espacio para creatividad sin autoexigencia excesiva.",
+        ],
+        "risk_low":[
+            "Procrastinación y baja tasa de finalización.",
+            "Desorden operativo si no hay supervisión.",
+        ],
+        "recs_low":[
+            "Timeboxing diario y checklist de 3 prioridades.",
+            "Revisión semanal con métricas de finalización.",
+        ],
+        "roles_high":["Gestión de Proyectos","Finanzas","Auditoría","Operaciones"],
+        "roles_low":["Ideación temprana abierta"],
+        "no_apt_high":["Entornos caóticos sin procesos definidos"],
+        "no_apt_low":["PMO, compliance, control interno"]
+    },
+    "Extraversión": {
+        "code":"E", "icon":"",
+        "desc":"Asertividad, sociabilidad y energía en interacción.",
+        "color":"#F2C6B4",
+        "fort_high":[
+            "Networking sostenido y visibilidad del equipo.",
+            "Comunicación clara ante grupos y stakeholders.",
+            "Motivación del equipo en contextos colaborativos.",
+        ],
+        "risk_high":[
+            "Riesgo de monopolizar conversaciones.",
+            "Puede subvalorar la escucha profunda/activa.",
+        ],
+        "fort_low":[
+            "Profundidad de análisis y foco individual.",
+            "Comunicación escrita sólida y estructurada.",
+        ],
+        "risk_low":[
+            "Evita exposición y grandes audiencias.",
+            "Menor presencia en foros de decisión.",
+        ],
+        "recs_low":[
+            "Exposición gradual a presentaciones (micro-stands).",
+            "Reuniones 1:1 para construir confianza.",
+        ],
+        "roles_high":["Ventas","Relaciones Públicas","Liderazgo Comercial","BD"],
+        "roles_low":["Análisis","Investigación","Programación","Datos"],
+        "no_apt_high":["Roles de aislamiento con mínima interacción"],
+        "no_apt_low":["Puestos comerciales de alto contacto inmediato"]
+    },
+    "Amabilidad": {
+        "code":"A", "icon":"",
+        "desc":"Colaboración, empatía y confianza.",
+        "color":"#E8D6CB",
+        "fort_high":[
+            "Clima de confianza y cohesión en el equipo.",
+            "Gestión empática de conflictos.",
+            "Excelente experiencia de cliente/usuario.",
+        ],
+        "risk_high":[
+            "Evitar conversaciones difíciles o decir 'no'.",
+            "Difícil establecer límites en alta presión.",
+        ],
+        "fort_low":[
+            "Objetividad y firmeza en decisiones.",
+            "Negociación más dura con foco en métricas.",
+        ],
+        "risk_low":[
+            "Relaciones sensibles pueden deteriorarse.",
+            "Riesgo de fricción intraequipo si no hay tacto.",
+        ],
+        "recs_low":[
+            "Entrenar feedback con método SBI.",
+            "Establecer límites claros por escrito.",
+        ],
+        "roles_high":["RR.HH.","Customer Success","Mediación","Atención a clientes"],
+        "roles_low":["Negociación dura","Trading"],
+        "no_apt_high":["Roles donde se requiere confrontación permanente"],
+        "no_apt_low":["Facilitación, mediación, soporte sensible"]
+    },
+    "Estabilidad Emocional": {
+        "code":"N", "icon":"",
+        "desc":"Gestión del estrés, resiliencia y calma bajo presión.",
+        "color":"#D6EADF",
+        "fort_high":[
+            "Serenidad en incidentes y crisis.",
+            "Recuperación rápida y foco en soluciones.",
+            "Juicio estable en incertidumbre.",
+        ],
+        "risk_high":[
+            "Subestimar señales de estrés ajeno.",
+            "Puede comunicar calma como frialdad.",
+        ],
+        "fort_low":[
+            "Sensibilidad que potencia empatía y creatividad.",
+        ],
+        "risk_low":[
+            "Rumiación, estrés elevado y fluctuaciones de ánimo.",
+            "Toma de decisiones afectada por presión.",
+        ],
+        "recs_low":[
+            "Técnicas 4-7-8 y pausas de respiración.",
+            "Rutina de sueño + journaling breve diario.",
+        ],
+        "roles_high":["Operaciones críticas","Dirección","Soporte incidentes","Compliance"],
+        "roles_low":["Ambientes caóticos sin soporte"],
+        "no_apt_high":["Roles donde se requiera hiper-empatía constante"],
+        "no_apt_low":["Puestos de alta presión sin acompañamiento"]
+    },
+}
+DIM_LIST = list(DIMENSIONES.keys())
+LIKERT = {1:"Totalmente en desacuerdo", 2:"En desacuerdo", 3:"Neutral", 4:"De acuerdo", 5:"Totalmente de acuerdo"}
+LIK_KEYS = list(LIKERT.keys())
+
+# 50 ítems (10 por dimensión; 5 directos, 5 invertidos)
+QUESTIONS = [
+    # O
+    {"text":"Tengo una imaginación muy activa.","dim":"Apertura a la Experiencia","key":"O1","rev":False},
+    {"text":"Me atraen ideas nuevas y complejas.","dim":"Apertura a la Experiencia","key":"O2","rev":False},
+    {"text":"Disfruto del arte y la cultura.","dim":"Apertura a la Experiencia","key":"O3","rev":False},
+    {"text":"Busco experiencias poco convencionales.","dim":"Apertura a la Experiencia","key":"O4","rev":False},
+    {"text":"Valoro la creatividad sobre la rutina.","dim":"Apertura a la Experiencia","key":"O5","rev":False},
+    {"text":"Prefiero mantener hábitos que probar cosas nuevas.","dim":"Apertura a la Experiencia","key":"O6","rev":True},
+    {"text":"Las discusiones filosóficas me parecen poco útiles.","dim":"Apertura a la Experiencia","key":"O7","rev":True},
+    {"text":"Rara vez reflexiono sobre conceptos abstractos.","dim":"Apertura a la Experiencia","key":"O8","rev":True},
+    {"text":"Me inclino por lo tradicional más que por lo original.","dim":"Apertura a la Experiencia","key":"O9","rev":True},
+    {"text":"Evito cambiar mis hábitos establecidos.","dim":"Apertura a la Experiencia","key":"O10","rev":True},
+    # C
+    {"text":"Estoy bien preparado/a para mis tareas.","dim":"Responsabilidad","key":"C1","rev":False},
+    {"text":"Cuido los detalles al trabajar.","dim":"Responsabilidad","key":"C2","rev":False},
+    {"text":"Cumplo mis compromisos y plazos.","dim":"Responsabilidad","key":"C3","rev":False},
+    {"text":"Sigo un plan y un horario definidos.","dim":"Responsabilidad","key":"C4","rev":False},
+    {"text":"Me exijo altos estándares de calidad.","dim":"Responsabilidad","key":"C5","rev":False},
+    {"text":"Dejo mis cosas desordenadas.","dim":"Responsabilidad","key":"C6","rev":True},
+    {"text":"Evito responsabilidades cuando puedo.","dim":"Responsabilidad","key":"C7","rev":True},
+    {"text":"Me distraigo con facilidad.","dim":"Responsabilidad","key":"C8","rev":True},
+    {"text":"Olvido colocar las cosas en su lugar.","dim":"Responsabilidad","key":"C9","rev":True},
+    {"text":"Aplazo tareas importantes.","dim":"Responsabilidad","key":"C10","rev":True},
+    # E
+    {"text":"Disfruto ser visible en reuniones.","dim":"Extraversión","key":"E1","rev":False},
+    {"text":"Me siento a gusto con personas nuevas.","dim":"Extraversión","key":"E2","rev":False},
+    {"text":"Busco la compañía de otras personas.","dim":"Extraversión","key":"E3","rev":False},
+    {"text":"Participo activamente en conversaciones.","dim":"Extraversión","key":"E4","rev":False},
+    {"text":"Me energiza compartir con otros.","dim":"Extraversión","key":"E5","rev":False},
+    {"text":"Prefiero estar solo/a que rodeado/a de gente.","dim":"Extraversión","key":"E6","rev":True},
+    {"text":"Soy más bien reservado/a y callado/a.","dim":"Extraversión","key":"E7","rev":True},
+    {"text":"Me cuesta expresarme ante grupos grandes.","dim":"Extraversión","key":"E8","rev":True},
+    {"text":"Prefiero actuar en segundo plano.","dim":"Extraversión","key":"E9","rev":True},
+    {"text":"Me agotan las interacciones sociales prolongadas.","dim":"Extraversión","key":"E10","rev":True},
+    # A
+    {"text":"Empatizo con las emociones de los demás.","dim":"Amabilidad","key":"A1","rev":False},
+    {"text":"Me preocupo por el bienestar ajeno.","dim":"Amabilidad","key":"A2","rev":False},
+    {"text":"Trato a otros con respeto y consideración.","dim":"Amabilidad","key":"A3","rev":False},
+    {"text":"Ayudo sin esperar nada a cambio.","dim":"Amabilidad","key":"A4","rev":False},
+    {"text":"Confío en las buenas intenciones de la gente.","dim":"Amabilidad","key":"A5","rev":False},
+    {"text":"No me interesa demasiado la gente.","dim":"Amabilidad","key":"A6","rev":True},
+    {"text":"Sospecho de las intenciones ajenas.","dim":"Amabilidad","key":"A7","rev":True},
+    {"text":"A veces soy poco considerado/a.","dim":"Amabilidad","key":"A8","rev":True},
+    {"text":"Pienso primero en mí antes que en otros.","dim":"Amabilidad","key":"A9","rev":True},
+    {"text":"Los problemas de otros no me afectan mucho.","dim":"Amabilidad","key":"A10","rev":True},
+    # N
+    {"text":"Me mantengo calmado/a bajo presión.","dim":"Estabilidad Emocional","key":"N1","rev":False},
+    {"text":"Rara vez me siento ansioso/a o estresado/a.","dim":"Estabilidad Emocional","key":"N2","rev":False},
+    {"text":"Soy emocionalmente estable.","dim":"Estabilidad Emocional","key":"N3","rev":False},
+    {"text":"Me recupero rápido de contratiempos.","dim":"Estabilidad Emocional","key":"N4","rev":False},
+    {"text":"Me siento seguro/a de mí mismo/a.","dim":"Estabilidad Emocional","key":"N5","rev":False},
+    {"text":"Me preocupo demasiado por las cosas.","dim":"Estabilidad Emocional","key":"N6","rev":True},
+    {"text":"Me irrito con facilidad.","dim":"Estabilidad Emocional","key":"N7","rev":True},
+    {"text":"Con frecuencia me siento triste.","dim":"Estabilidad Emocional","key":"N8","rev":True},
+    {"text":"Tengo cambios de ánimo frecuentes.","dim":"Estabilidad Emocional","key":"N9","rev":True},
+    {"text":"El estrés me sobrepasa.","dim":"Estabilidad Emocional","key":"N10","rev":True},
+]
+KEY2IDX = {q["key"]:i for i,q in enumerate(QUESTIONS)}
+
+# ---------------------------------------------------------------
+# Umbrales y textos genéricos de la narrativa por dimensión
+# ---------------------------------------------------------------
+# Bandas de nivel: LEVELS[i] aplica desde LEVEL_CUTS[i-1] (inclusive)
+LEVEL_CUTS = (25, 40, 60, 75)
+LEVELS = [("Muy Bajo","Mínimo"), ("Bajo","Suave"), ("Promedio","Moderado"),
+          ("Alto","Marcado"), ("Muy Alto","Dominante")]
+# Perfil narrativo: < PROFILE_CUTS[0] bajo · ≥ PROFILE_CUTS[1] alto · resto medio
+PROFILE_CUTS = (40, 60)
+PROFILE_TEXTS = {
+    "high": {
+        "fort_extra": [
+            "Capacidad de modelar buenas prácticas para pares.",
+            "Eleva el estándar del equipo en esa dimensión."
+        ],
+        "risk_extra": ["Si no se regula, impacta foco/tiempos de otros."],
+        "recs": [
+            "Definir OKRs y criterios de cierre por sprint.",
+            "Hitos intermedios con aceptación por pares.",
+            "Revisión quincenal para calibrar foco/impacto."
+        ],
+        "expl": "KPI alto: tu conducta típica favorece el desempeño cuando el rol exige este rasgo como palanca principal.",
+    },
+    "low": {
+        "fort_extra": ["Estabilidad de ejecución en límites conocidos."],
+        "risk_extra": ["Puede requerir soporte explícito en entornos de presión/ambigüedad."],
+        "recs_extra": [
+            "Rutina breve semanal de reflexión de aprendizajes.",
+            "Definir 1 hábito palanca (2 min/día) durante 21 días."
+        ],
+        "expl": "KPI bajo: tu estilo se sitúa en el extremo opuesto; útil en ciertos contextos, con riesgos en otros si no hay compensaciones.",
+    },
+    "mid": {
+        "fort": ["Balance situacional entre ambos extremos", "Capacidad de lectura del contexto antes de actuar"],
+        "risk": ["Variabilidad entre equipos/líderes; alinear expectativas", "Riesgo de ambivalencia si faltan métricas claras"],
+        "recs": ["Definir escenarios de cuándo 'subir' o 'bajar' este rasgo", "Feedback mensual de 360° enfocado en esta dimensión"],
+        "expl": "KPI medio: perfil flexible; puede optimizarse con reglas simples de activación según el entorno.",
+    },
+}
+
+# ---------------------------------------------------------------
+# Instrumento: ítems + escala + narrativas + umbrales, con los
+# índices precalculados que necesita el cálculo vectorizado.
+# Los packs versionados (ver instrument_packs.py) se compilan a esto.
+# ---------------------------------------------------------------
+class Instrument:
+    def __init__(self, pack:dict):
+        self.id = pack["id"]; self.version = str(pack["version"])
+        self.name = pack.get("name", self.id); self.language = pack.get("language", "es")
+        self.dims = pack["dimensions"]
+        self.dim_list = list(self.dims)
+        self.likert = {int(k): v for k, v in pack["likert"].items()}
+        self.lik_keys = sorted(self.likert)
+        self.questions = pack["items"]
+        self.key2idx = {q["key"]: i for i, q in enumerate(self.questions)}
+        th = pack.get("thresholds", {})
+        self.level_cuts = tuple(th.get("levels", LEVEL_CUTS))
+        self.levels = [tuple(x) for x in th.get("level_names", LEVELS)]
+        self.profile_cuts = tuple(th.get("profile", PROFILE_CUTS))
+        self.profile_texts = pack.get("profile_texts", PROFILE_TEXTS)
+        self.content_hash = pack.get("content_hash", "")
+        # Escala: extremos, punto neutro (respuesta ausente) y suma para invertir
+        self.lo, self.hi = self.lik_keys[0], self.lik_keys[-1]
+        self.neutral = (self.lo + self.hi) / 2
+        # Índices para lotes: matriz (N × ítems) int8 con 0 = sin respuesta
+        self.rev_mask = np.array([q["rev"] for q in self.questions], dtype=bool)
+        self.dim_onehot = np.array([[q["dim"] == d for d in self.dim_list] for q in self.questions], dtype=np.float64)
+        self.dim_counts = self.dim_onehot.sum(axis=0)
+
+    @property
+    def key(self)->str:
+        return f"{self.id}@{self.version}"
+
+    def reverse_score(self, v:int)->int:
+        return self.lo + self.hi - v
+
+    def compute_scores(self, answers:dict)->dict:
+        buckets = {d:[] for d in self.dim_list}
+        for q in self.questions:
+            raw = answers.get(q["key"])
+            v = self.neutral if raw is None else (self.reverse_score(raw) if q["rev"] else raw)
+            buckets[q["dim"]].append(v)
+        out = {}
+        for d, vals in buckets.items():
+            avg = np.mean(vals)
+            perc = ((avg - self.lo) / (self.hi - self.lo)) * 100
+            out[d] = round(float(perc), 1)
+        return out
+
+    def answers_matrix(self, answer_sets:list)->np.ndarray:
+        A = np.zeros((len(answer_sets), len(self.questions)), dtype=np.int8)
+        for i, answers in enumerate(answer_sets):
+            for k, v in answers.items():
+                if v is not None: A[i, self.key2idx[k]] = v
+        return A
+
+    def compute_scores_batch(self, A:np.ndarray, decimals:int|None=1)->np.ndarray:
+        """Puntuaciones (N × dimensiones) en el orden de dim_list; mismo redondeo que compute_scores.
+        Con decimals=None devuelve la puntuación sin redondear."""
+        A = np.asarray(A, dtype=np.float64)
+        v = np.where(A == 0, self.neutral, np.where(self.rev_mask, self.lo + self.hi - A, A))
+        avg = (v @ self.dim_onehot) / self.dim_counts
+        pct = ((avg - self.lo) / (self.hi - self.lo)) * 100
+        return pct if decimals is None else np.round(pct, decimals)
+
+    def level_label(self, score:float):
+        return self.levels[bisect_right(self.level_cuts, score)]
+
+    def level_codes(self, scores:np.ndarray)->np.ndarray:
+        """Índice de banda (0 = más bajo) para una matriz de puntuaciones."""
+        return np.searchsorted(self.level_cuts, scores, side="right").astype(np.int8)
+
+    def dimension_profile(self, d:str, score:float):
+        ds = self.dims[d]; low_cut, high_cut = self.profile_cuts
+        if score>=high_cut:
+            t = self.profile_texts["high"]
+            f = ds["fort_high"] + t["fort_extra"]
+            r = ds["risk_high"] + t["risk_extra"]
+            rec = list(t["recs"])
+            roles = ds["roles_high"]; not_apt = ds.get("no_apt_high", [])
+        elif score<low_cut:
+            t = self.profile_texts["low"]
+            f = ds["fort_low"] + t["fort_extra"]
+            r = ds["risk_low"] + t["risk_extra"]
+            rec = ds["recs_low"] + t["recs_extra"]
+            roles = ds["roles_low"]; not_apt = ds.get("no_apt_low", [])
+        else:
+            t = self.profile_texts["mid"]
+            f = list(t["fort"]); r = list(t["risk"]); rec = list(t["recs"])
+            roles = ds["roles_high"][:2] + ds["roles_low"][:1]; not_apt = []
+        return f, r, rec, roles, not_apt, t["expl"]
+
+    def canonical(self, res:dict)->dict:
+        """Puntuaciones con los nombres de dimensión del instrumento por defecto (vía código OCEAN)."""
+        return {DIM_BY_CODE[self.dims[d]["code"]]: v for d, v in res.items()}
+
+BUILTIN_PACK = {
+    "format": 1, "id": "bigfive-es", "version": "1.0", "language": "es",
+    "name": "Big Five laboral (50 ítems, español)",
+    "likert": LIKERT, "dimensions": DIMENSIONES, "items": QUESTIONS,
+    "thresholds": {"levels": list(LEVEL_CUTS), "level_names": [list(x) for x in LEVELS],
+                   "profile": list(PROFILE_CUTS)},
+    "profile_texts": PROFILE_TEXTS,
+}
+BUILTIN = Instrument(BUILTIN_PACK)
+DIM_BY_CODE = {ds["code"]: d for d, ds in DIMENSIONES.items()}
+
+# ---------------------------------------------------------------
+# Utilidades de cálculo (instrumento por defecto)
+# ---------------------------------------------------------------
+REV_MASK, DIM_ONEHOT, DIM_COUNTS = BUILTIN.rev_mask, BUILTIN.dim_onehot, BUILTIN.dim_counts
+
+def compute_scores(answers:dict)->dict:
+    return BUILTIN.compute_scores(answers)
+
+def answers_matrix(answer_sets:list)->np.ndarray:
+    return BUILTIN.answers_matrix(answer_sets)
+
+def compute_scores_batch(A:np.ndarray)->np.ndarray:
+    """Puntuaciones (N × 5) en el orden de DIM_LIST; mismo redondeo que compute_scores."""
+    return BUILTIN.compute_scores_batch(A)
+
+def level_label(score:float):
+    return BUILTIN.level_label(score)
+
+def level_codes(scores:np.ndarray)->np.ndarray:
+    """Índice de banda (0 = Muy Bajo … 4 = Muy Alto) para una matriz de puntuaciones."""
+    return BUILTIN.level_codes(scores)
+
+def dimension_profile(d:str, score:float):
+    return BUILTIN.dimension_profile(d, score)
+
+# ---------------------------------------------------------------
+# Exportar (PDF con medidores; HTML si no hay MPL)
+# ---------------------------------------------------------------
+def pdf_semicircle(ax, value, cx=0.5, cy=0.5, r=0.45):
+    """Dibuja un medidor semicircular matplotlib (0–100)."""
+    v = max(0, min(100, float(value)))
+    bands = [(0,25,"#fde2e1"), (25,40,"#fff0c2"), (40,60,"#e9f2fb"),
+             (60,75,"#e7f6e8"), (75,100,"#d9f2db")]
+    for a,b,c in bands:
+        ang1 = 180*(a/100.0); ang2 = 180*(b/100.0)
+        w = Wedge((cx,cy), r, 180-ang2, 180-ang1, facecolor=c, edgecolor="#fff", lw=1)
+        ax.add_patch(w)
+    import math
+    theta = math.radians(180*(v/100.0))
+    x2 = cx + r*0.95*math.cos(np.pi - theta)
+    y2 = cy + r*0.95*math.sin(np.pi - theta)
+    ax.plot([cx, x2], [cy, y2], color="#6D597A", lw=3)
+    ax.add_patch(Circle((cx,cy), 0.02, color="#6D597A"))
+    ax.text(cx, cy-0.12, f"{v:.1f}", ha="center", va="center", fontsize=16, color="#111")
+
+def build_pdf(res:dict, fecha:str, inst:Instrument=BUILTIN)->bytes:
+    order = list(res.keys()); vals=[res[d] for d in order]
+    avg = np.mean(vals); std = np.std(vals, ddof=1) if len(vals)>1 else 0.0
+    rng = np.max(vals)-np.min(vals); top = max(res, key=res.get); low = min(res, key=res.get)
+
+    buf = BytesIO()
+    # Sin CreationDate: el mismo informe produce los mismos bytes (deduplicación en PayloadStore)
+    with PdfPages(buf, metadata={"CreationDate": None}) as pdf:
+        # Portada + KPIs con 3 medidores semicirculares
+        fig = plt.figure(figsize=(8.27,11.69))  # A4
+        ax = fig.add_axes([0,0,1,1]); ax.axis('off')
+        ax.text(.5,.95,"Informe Big Five — Contexto Laboral", ha='center', fontsize=20, fontweight='bold')
+        ax.text(.5,.92,f"Fecha: {fecha}", ha='center', fontsize=11)
+
+        # Tarjetas KPI
+        def card(ax, x,y,w,h,title,val):
+            r = FancyBboxPatch((x,y), w,h, boxstyle="round,pad=0.012,rounding_size=0.018",
+                               edgecolor="#dddddd", facecolor="#ffffff")
+            ax.add_patch(r)
+            ax.text(x+w*0.06, y+h*0.60, title, fontsize=10, color="#333")
+            ax.text(x+w*0.06, y+h*0.25, f"{val}", fontsize=20, fontweight='bold')
+
+        Y0 = .82; H = .10; W = .40; GAP = .02
+        card(ax, .06, Y0, W, H, "Promedio (0–100)", f"{avg:.1f}")
+        card(ax, .54, Y0, W, H, "Desviación estándar", f"{std:.2f}")
+        card(ax, .06, Y0-(H+GAP), W, H, "Rango entre dimensiones", f"{rng:.2f}")
+        card(ax, .54, Y0-(H+GAP), W, H, "Dimensión destacada", f"{top}")
+
+        # Tres medidores (promedio, mejor, menor)
+        axg1 = fig.add_axes([.12, .54, .22, .16]); axg1.axis('off'); pdf_semicircle(axg1, avg, 0.5, 0.0, 0.9); axg1.text(.5,-.35,"Promedio",ha="center",fontsize=10)
+        axg2 = fig.add_axes([.39, .54, .22, .16]); axg2.axis('off'); pdf_semicircle(axg2, res[top], 0.5, 0.0, 0.9); axg2.text(.5,-.35,f"Mayor: {top}",ha="center",fontsize=10)
+        axg3 = fig.add_axes([.66, .54, .22, .16]); axg3.axis('off'); pdf_semicircle(axg3, res[low], 0.5, 0.0, 0.9); axg3.text(.5,-.35,f"Menor: {low}",ha="center",fontsize=10)
+
+        # Lista breve
+        ylist = .46
+        ax.text(.08,ylist,"Resumen ejecutivo", fontsize=14, fontweight='bold'); ylist -= .04
+        bullets = [
+            f"Fortaleza clave: {top} ({res[top]:.1f})",
+            f"Área a potenciar: {low} ({res[low]:.1f})",
+            "Perfil global equilibrado" if 40<=avg<=60 else ("Tendencia alta para ambientes exigentes" if avg>60 else "Perfil conservador, ideal para entornos estables"),
+            f"Variabilidad: DE={std:.2f} · Rango={rng:.2f}",
+        ]
+        for b in bullets:
+            ax.text(.10, ylist, f"• {b}", fontsize=11); ylist -= .03
+
+        pdf.savefig(fig, bbox_inches='tight'); plt.close(fig)
+
+        # Barras
+        fig2 = plt.figure(figsize=(8.27,11.69))
+        a2 = fig2.add_subplot(111)
+        y = np.arange(len(order))
+        a2.barh(y, [res[d] for d in order], color="#81B29A")
+        a2.set_yticks(y); a2.set_yticklabels(order)
+        a2.set_xlim(0,100); a2.set_xlabel("Puntuación (0–100)")
+        a2.set_title("Puntuaciones por dimensión")
+        for i, v in enumerate([res[d] for d in order]):
+            a2.text(v+1, i, f"{v:.1f}", va='center', fontsize=9)
+        pdf.savefig(fig2, bbox_inches='tight'); plt.close(fig2)
+
+        # Análisis por dimensión con medidor
+        for d in order:
+            score = res[d]; lvl, tag = inst.level_label(score)
+            f, r, recs, roles, not_apt, expl = inst.dimension_profile(d, score)
+
+            fig3 = plt.figure(figsize=(8.27,11.69)); ax3 = fig3.add_axes([0,0,1,1]); ax3.axis('off')
+            ax3.text(.5,.95, f"{inst.dims[d]['code']} — {d}", ha='center', fontsize=16, fontweight='bold')
+            ax3.text(.5,.92, f"Puntuación: {score:.1f} · Nivel: {lvl} ({tag})", ha='center', fontsize=11)
+
+            # Gauge de dimensión
+            axg = fig3.add_axes([.18, .80, .64, .14]); axg.axis("off")
+            pdf_semicircle(axg, score, cx=0.5, cy=0.0, r=0.9)
+
+            def draw_list(y, title, items):
+                ax3.text(.08,y,title, fontsize=13, fontweight='bold')
+                yy = y - .03
+                for it in items:
+                    ax3.text(.10, yy, f"• {it}", fontsize=11)
+                    yy -= .03
+                return yy -.02
+
+            ax3.text(.08,.78,"Descripción", fontsize=13, fontweight='bold')
+            ax3.text(.08,.75, inst.dims[d]["desc"], fontsize=11)
+            ax3.text(.08,.71,"Explicativo del KPI", fontsize=13, fontweight='bold')
+            ax3.text(.08,.68, expl, fontsize=11)
+
+            yy = .63
+            yy = draw_list(yy, "Fortalezas (laborales)", f)
+            yy = draw_list(yy, "Riesgos / Cosas a cuidar", r)
+            yy = draw_list(yy, "Recomendaciones", recs)
+            yy = draw_list(yy, "Roles sugeridos", roles)
+            draw_list(yy, "No recomendado para", not_apt if not_apt else ["—"])
+
+            pdf.savefig(fig3, bbox_inches='tight'); plt.close(fig3)
+
+    buf.seek(0)
+    return buf.read()
+
+def build_html(res:dict, fecha:str, inst:Instrument=BUILTIN)->bytes:
+    order = list(res.keys()); vals=[res[d] for d in order]
+    avg=np.mean(vals); std=np.std(vals, ddof=1) if len(vals)>1 else 0.0; rng=np.max(vals)-np.min(vals); top=max(res,key=res.get)
+    rows = ""
+    for d in order:
+        lvl,tag = inst.level_label(res[d])
+        rows += f"<tr><td>{inst.dims[d]['code']}</td><td>{d}</td><td>{res[d]:.1f}</td><td>{lvl}</td><td>{tag}</td></tr>"
+    blocks=""
+    for d in order:
+        score=res[d]; lvl,tag = inst.level_label(score)
+        f,r,recs,roles,not_apt, expl = inst.dimension_profile(d, score)
+        blocks += f"""
+<section style="border:1px solid #eee; border-radius:12px; padding:14px; margin:14px 0;">
+  <h3 style="margin:.2rem 0;">{inst.dims[d]['code']} — {d} <span class='tag'>{score:.1f} · {lvl} ({tag})</span></h3>
+  <p style="margin:.25rem 0; color:#333;">{inst.dims[d]["desc"]}</p>
+  <h4>Explicativo del KPI</h4>
+  <p>{expl}</p>
+  <div style="display:grid; grid-template-columns: repeat(auto-fit, minmax(220px,1fr)); gap:12px;">
+    <div><h4>Fortalezas</h4><ul>{''.join([f'<li>{x}</li>' for x in f])}</ul></div>
+    <div><h4>Riesgos</h4><ul>{''.join([f'<li>{x}</li>' for x in r])}</ul></div>
+    <div><h4>Recomendaciones</h4><ul>{''.join([f'<li>{x}</li>' for x in recs])}</ul></div>
+  </div>
+  <div style="display:grid; grid-template-columns: repeat(auto-fit, minmax(220px,1fr)); gap:12px; margin-top:10px;">
+    <div><h4>Roles sugeridos</h4><ul>{''.join([f'<li>{x}</li>' for x in roles])}</ul></div>
+    <div><h4>No recomendado para</h4><ul>{''.join([f'<li>{x}</li>' for x in (not_apt if not_apt else ['—'])])}</ul></div>
+  </div>
+</section>
+"""
+    html=f"""<!doctype html>
+<html><head><meta charset="utf-8" />
+<title>Informe Big Five Laboral</title>
+<style>
+body{{font-family:Inter,Arial; margin:24px; color:#111;}}
+h1{{font-size:24px; margin:0 0 8px 0;}}
+h3{{font-size:18px; margin:.2rem 0;}}
+h4{{font-size:15px; margin:.2rem 0;}}
+table{{border-collapse:collapse; width:100%; margin-top:8px}}
+th,td{{border:1px solid #eee; padding:8px; text-align:left;}}
+.tag{{display:inline-block; padding:.2rem .6rem; border:1px solid #eee; border-radius:999px; font-size:.82rem;}}
+.kpi-grid{{display:grid; grid-template-columns:repeat(auto-fit,minmax(220px,1fr)); gap:12px; margin:10px 0 6px 0;}}
+.kpi{{border:1px solid #eee; border-radius:12px; padding:12px; background:#fff;}}
+.kpi .label{{font-size:13px; opacity:.85}}
+.kpi .value{{font-size:22px; font-weight:800}}
+@media print{{ .no-print{{display:none}} }}
+</style>
+</head>
+<body>
+<h1>Informe Big Five — Contexto Laboral</h1>
+<p>Fecha: <b>{escape(str(fecha))}</b></p>
+<div class="kpi-grid">
+  <div class="kpi"><div class="label">Promedio general (0–100)</div><div class="value">{avg:.1f}</div></div>
+  <div class="kpi"><div class="label">Desviación estándar</div><div class="value">{std:.2f}</div></div>
+  <div class="kpi"><div class="label">Rango</div><div class="value">{rng:.2f}</div></div>
+  <div class="kpi"><div class="label">Dimensión destacada</div><div class="value">{top}</div></div>
+</div>
+
+<h3>Tabla resumen</h3>
+<table>
+  <thead><tr><th>Código</th><th>Dimensión</th><th>Puntuación</th><th>Nivel</th><th>Etiqueta</th></tr></thead>
+  <tbody>{rows}</tbody>
+</table>
+
+<h3>Análisis por dimensión (laboral)</h3>
+{blocks}
+
+<div class="no-print" style="margin-top:16px;">
+  <button onclick="window.print()" style="padding:10px 14px; border:1px solid #ddd; background:#f9f9f9; border-radius:8px; cursor:pointer;">
+    Imprimir / Guardar como PDF
+  </button>
+</div>
+</body></html>"""
+    return html.encode("utf-8")
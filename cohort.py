@@ -0,0 +1,148 @@
+# ================================================================
+#  Big Five — Agregados de cohorte mantenidos incrementalmente
+#  count / suma / suma de cuadrados / histogramas por grupo y por mes.
+#  Cada resultado nuevo cuesta O(1); el dashboard nunca relee filas.
+# ================================================================
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+import numpy as np
+
+from bigfive import BUILTIN, DIM_LIST
+
+HIST_EDGES = np.linspace(0, 100, 21)  # 20 tramos de 5 puntos
+ALL = "Todos"
+SIN_AREA = "Sin área"
+
+class GroupStats:
+    """Estadísticos suficientes de un grupo: bastan para media, DE e histograma."""
+    def __init__(self):
+        self.count = 0
+        self.sum = np.zeros(len(DIM_LIST))
+        self.sumsq = np.zeros(len(DIM_LIST))
+        self.hist = np.zeros((len(DIM_LIST), len(HIST_EDGES) - 1), dtype=np.int64)
+
+    def add(self, vec:np.ndarray):
+        self.count += 1
+        self.sum += vec
+        self.sumsq += vec * vec
+        bins = np.clip(np.searchsorted(HIST_EDGES, vec, side="right") - 1, 0, len(HIST_EDGES) - 2)
+        self.hist[np.arange(len(DIM_LIST)), bins] += 1
+
+    def mean(self)->dict:
+        m = self.sum / max(self.count, 1)
+        return {d: round(float(v), 1) for d, v in zip(DIM_LIST, m)}
+
+    def std(self)->dict:
+        if self.count < 2: return {d: 0.0 for d in DIM_LIST}
+        var = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+        return {d: round(float(v), 2) for d, v in zip(DIM_LIST, np.sqrt(np.maximum(var, 0)))}
+
+    def to_dict(self)->dict:
+        return {"count": self.count, "sum": self.sum.tolist(), "sumsq": self.sumsq.tolist(),
+                "hist": self.hist.tolist()}
+
+    @classmethod
+    def from_dict(cls, d:dict):
+        g = cls()
+        g.count = d["count"]; g.sum = np.array(d["sum"]); g.sumsq = np.array(d["sumsq"])
+        g.hist = np.array(d["hist"], dtype=np.int64)
+        return g
+
+class CohortAggregates:
+    def __init__(self):
+        self.groups = {}   # área -> GroupStats (incluye ALL)
+        self.months = {}   # "YYYY-MM" -> GroupStats
+        self.version = 0   # cambia con cada resultado; sirve de clave de caché
+
+    def add(self, res:dict, area:str, when:datetime):
+        vec = np.array([res[d] for d in DIM_LIST], dtype=np.float64)
+        for key in (ALL, area or SIN_AREA):
+            self.groups.setdefault(key, GroupStats()).add(vec)
+        self.months.setdefault(when.strftime("%Y-%m"), GroupStats()).add(vec)
+        self.version += 1
+
+    def to_dict(self)->dict:
+        return {"version": self.version,
+                "groups": {k: g.to_dict() for k, g in self.groups.items()},
+                "months": {k: g.to_dict() for k, g in self.months.items()}}
+
+    @classmethod
+    def from_dict(cls, d:dict):
+        agg = cls()
+        agg.version = d.get("version", 0)
+        agg.groups = {k: GroupStats.from_dict(v) for k, v in d.get("groups", {}).items()}
+        agg.months = {k: GroupStats.from_dict(v) for k, v in d.get("months", {}).items()}
+        return agg
+
+def iter_results(path:str, offset:int=0, instrumento:str|None=None):
+    """Filas completas del JSONL de resultados desde `offset`, como (fila, offset tras la fila).
+
+    Una última línea sin salto es una escritura a medias: se deja para la próxima lectura.
+    Con `instrumento` se omiten las filas de otros instrumentos (las que no lo indican
+    son anteriores a los packs, del instrumento por defecto).
+    """
+    if not os.path.exists(path): return
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        for line in fh:
+            if not line.endswith(b"\n"): break  # escritura a medias
+            offset += len(line)
+            row = json.loads(line)
+            if instrumento is not None and row.get("instrumento", BUILTIN.key) != instrumento: continue
+            yield row, offset
+
+class CohortStore:
+    """Resultados en JSONL (append) + instantánea de agregados con el offset ya procesado.
+
+    Al arrancar solo se reprocesan las filas escritas después de la última instantánea.
+    """
+    def __init__(self, data_dir:str):
+        os.makedirs(data_dir, exist_ok=True)
+        self.results_path = os.path.join(data_dir, "resultados.jsonl")
+        self.snapshot_path = os.path.join(data_dir, "cohorte.json")
+        self.lock = threading.Lock()
+        self.aggregates, self.offset = CohortAggregates(), 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as fh:
+                snap = json.load(fh)
+            self.aggregates = CohortAggregates.from_dict(snap["aggregates"])
+            self.offset = snap["offset"]
+        self._catch_up()
+
+    def _catch_up(self):
+        if not os.path.exists(self.results_path): return
+        for row, self.offset in iter_results(self.results_path, self.offset):
+            self._apply(row)
+        self._save_snapshot()
+
+    def _apply(self, row:dict):
+        self.aggregates.add(row["scores"], row.get("area", ""), datetime.fromisoformat(row["ts"]))
+
+    def _save_snapshot(self):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"offset": self.offset, "aggregates": self.aggregates.to_dict()}, fh)
+        os.replace(tmp, self.snapshot_path)
+
+    def snapshot(self)->CohortAggregates:
+        """Copia de los agregados tomada bajo el lock (record puede añadir áreas o meses a la vez)."""
+        with self.lock:
+            return CohortAggregates.from_dict(self.aggregates.to_dict())
+
+    def record(self, res:dict, answers:dict, area:str="", when:datetime|None=None, **extra)->str:
+        """Guarda un resultado completado y actualiza los agregados. Devuelve su id."""
+        when = when or datetime.now()
+        row = {"id": uuid.uuid4().hex, "ts": when.isoformat(timespec="seconds"),
+               "area": (area or "").strip(), "scores": res, "answers": answers, **extra}
+        line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            with open(self.results_path, "ab") as fh:
+                fh.write(line)
+            self._apply(row)
+            self.offset += len(line)
+            self._save_snapshot()
+        return row["id"]
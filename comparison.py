@@ -0,0 +1,291 @@
+# ================================================================
+#  Big Five — Informe comparativo de finalistas (5–20 candidatos)
+#  Un solo documento: radar superpuesto, rejilla de medidores, tabla
+#  ordenada con bandas de level_label y estadísticos de rango por
+#  dimensión. Lo estático (cabeceras, leyenda, fondos de banda) se
+#  dibuja una vez y se reutiliza en cada medidor y en cada página.
+#  Uso: python comparison.py --bench          (tiempo vs nº de candidatos)
+# ================================================================
+import argparse
+import math
+import textwrap
+import time
+from io import BytesIO
+
+import numpy as np
+
+from bigfive import HAS_MPL, BUILTIN, Instrument
+
+if HAS_MPL:
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.collections import LineCollection, PathCollection
+    from matplotlib.path import Path
+    from matplotlib.transforms import Affine2D
+
+MAX_CANDIDATES = 20
+ROWS_PER_PAGE = 10                  # filas de la rejilla de medidores por página A4
+BAND_COLORS = ["#fde2e1", "#fff0c2", "#e9f2fb", "#e7f6e8", "#d9f2db"]  # los de pdf_semicircle
+PALETTE = ["#6D597A", "#81B29A", "#E07A5F", "#F2CC8F", "#9C6644", "#A1C3D1", "#B56576", "#3D405B",
+           "#E5989B", "#52796F", "#D4A373", "#457B9D", "#8D99AE", "#CB997E", "#6B705C", "#B5838D",
+           "#2A9D8F", "#E9C46A", "#F4A261", "#264653"]
+SORT_KEYS = ("media", "rango")      # o el código de una dimensión
+
+# ---------------------------------------------------------------
+# Datos y estadísticos (una pasada vectorizada)
+# ---------------------------------------------------------------
+def score_matrix(candidates:list, inst:Instrument=BUILTIN):
+    """[(etiqueta, {dimensión: puntuación})] -> (etiquetas, S (n × dimensiones) en el orden de dim_list)."""
+    if not candidates: raise ValueError("se necesita al menos un candidato")
+    if len(candidates) > MAX_CANDIDATES: raise ValueError(f"máximo {MAX_CANDIDATES} candidatos por informe")
+    labels = [str(label) for label, _ in candidates]
+    S = np.array([[float(res[d]) for d in inst.dim_list] for _, res in candidates], dtype=np.float64)
+    return labels, S
+
+def rank_stats(S:np.ndarray)->dict:
+    """Puestos (1 = mejor; empates comparten puesto) y resumen por dimensión sobre S (n × d)."""
+    n = len(S)
+    ranks = (S[None, :, :] > S[:, None, :]).sum(axis=1) + 1    # ranks[i, k] = 1 + nº de j con S[j,k] > S[i,k]
+    mean = S.mean(axis=0)
+    std = S.std(axis=0, ddof=1) if n > 1 else np.zeros(S.shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(std > 0, (S - mean) / std, 0.0)
+    return {"ranks": ranks, "mean_rank": ranks.mean(axis=1), "overall": S.mean(axis=1), "z": z,
+            "mean": mean, "std": std, "min": S.min(axis=0), "max": S.max(axis=0),
+            "median": np.median(S, axis=0), "best": S.argmax(axis=0)}
+
+def sort_order(S:np.ndarray, stats:dict, sort_by:str="media", inst:Instrument=BUILTIN)->np.ndarray:
+    if sort_by == "media": return np.argsort(-stats["overall"], kind="stable")
+    if sort_by == "rango": return np.argsort(stats["mean_rank"], kind="stable")
+    codes = [inst.dims[d]["code"] for d in inst.dim_list]
+    if sort_by not in codes: raise ValueError(f"sort_by debe ser uno de {SORT_KEYS + tuple(codes)}")
+    return np.argsort(-S[:, codes.index(sort_by)], kind="stable")
+
+def band_colors(inst:Instrument=BUILTIN)->list:
+    n = len(inst.levels)
+    if n == len(BAND_COLORS): return BAND_COLORS
+    return [BAND_COLORS[round(i * (len(BAND_COLORS) - 1) / max(n - 1, 1))] for i in range(n)]
+
+# ---------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------
+A4 = (8.27, 11.69)
+
+def _radar_page(pdf, labels, S, fecha, inst):
+    codes = [inst.dims[d]["code"] for d in inst.dim_list]
+    fig = plt.figure(figsize=A4)
+    fig.text(.5, .95, "Informe comparativo Big Five — Finalistas", ha="center", fontsize=20, fontweight="bold")
+    fig.text(.5, .925, f"Fecha: {fecha} · {len(labels)} candidatos", ha="center", fontsize=11)
+    ax = fig.add_axes([.18, .32, .64, .50], polar=True)
+    ang = np.linspace(0, 2 * np.pi, len(codes), endpoint=False)
+    ang_c = np.append(ang, ang[0])
+    ax.set_xticks(ang); ax.set_xticklabels([f"{c} {d}" for c, d in zip(codes, inst.dim_list)], fontsize=9)
+    ax.set_ylim(0, 100); ax.set_yticks([25, 50, 75]); ax.tick_params(axis="y", labelsize=8)
+    # Todas las polilíneas en una sola colección (un artista, un estilo por fila)
+    closed = np.concatenate([S, S[:, :1]], axis=1)
+    segs = [np.column_stack([ang_c, row]) for row in closed]
+    colors = [PALETTE[i % len(PALETTE)] for i in range(len(labels))]
+    ax.add_collection(LineCollection(segs, colors=colors, linewidths=1.8))
+    ax.legend(handles=[plt.Line2D([], [], color=c, lw=2) for c in colors], labels=labels,
+              loc="upper center", bbox_to_anchor=(.5, -.08), ncol=4, fontsize=8, frameon=False)
+    pdf.savefig(fig); plt.close(fig)
+
+def _tables_page(pdf, labels, S, stats, order, inst):
+    codes = [inst.dims[d]["code"] for d in inst.dim_list]
+    colors = band_colors(inst)
+    codes_band = inst.level_codes(S)
+    fig = plt.figure(figsize=A4)
+    fig.text(.5, .95, "Tabla ordenada y puestos por dimensión", ha="center", fontsize=16, fontweight="bold")
+    ax = fig.add_axes([.04, .36, .92, .56]); ax.axis("off")
+    cells = [[str(p), labels[i], *(f"{S[i, k]:.1f} (#{stats['ranks'][i, k]})\n{inst.levels[codes_band[i, k]][0]}"
+                                   for k in range(len(codes))),
+              f"{stats['overall'][i]:.1f}", f"{stats['mean_rank'][i]:.1f}"]
+             for p, i in enumerate(order, 1)]
+    fills = [["#ffffff", "#ffffff", *(colors[codes_band[i, k]] for k in range(len(codes))), "#ffffff", "#ffffff"]
+             for i in order]
+    w = (1 - .05 - .16 - .08 - .11) / len(codes)
+    t = ax.table(cellText=cells, cellColours=fills, colLabels=["#", "Candidato", *codes, "Media", "Puesto medio"],
+                 colWidths=[.05, .16, *[w] * len(codes), .08, .11], bbox=[0, 0, 1, 1], cellLoc="center")
+    t.auto_set_font_size(False); t.set_fontsize(7)
+    ax2 = fig.add_axes([.04, .06, .92, .22]); ax2.axis("off")
+    ax2.text(0, 1, "Estadísticos por dimensión (entre los finalistas)", fontsize=12, fontweight="bold",
+             transform=ax2.transAxes, va="bottom")
+    rows = [[f"{c} {d}", f"{stats['mean'][k]:.1f}", f"{stats['std'][k]:.2f}", f"{stats['min'][k]:.1f}",
+             f"{stats['median'][k]:.1f}", f"{stats['max'][k]:.1f}", labels[stats["best"][k]]]
+            for k, (c, d) in enumerate(zip(codes, inst.dim_list))]
+    t2 = ax2.table(cellText=rows, colLabels=["Dimensión", "Media", "DE", "Mín", "Mediana", "Máx", "Mejor"],
+                   colWidths=[.26, .1, .1, .1, .1, .1, .24], bbox=[0, 0, 1, 1], cellLoc="center")
+    t2.auto_set_font_size(False); t2.set_fontsize(8)
+    pdf.savefig(fig); plt.close(fig)
+
+class _GaugeGrid:
+    """Página de rejilla de medidores que se construye una vez y se reutiliza por página.
+
+    Cabecera, nombres de columna, leyenda de bandas y la geometría de las bandas son
+    fijos; en cada página solo cambian los desplazamientos de las colecciones (un
+    único trazado por banda, que el PDF guarda una vez y referencia en cada medidor),
+    las agujas (una LineCollection) y los textos de valor.
+    """
+    LEFT, TOP, CELL_W, CELL_H, R = 1.9, 1.45, 1.22, 0.90, 0.46   # pulgadas
+
+    def __init__(self, inst:Instrument):
+        self.inst = inst
+        self.fig = plt.figure(figsize=A4)
+        ax = self.ax = self.fig.add_axes([0, 0, 1, 1]); ax.axis("off")
+        ax.set_xlim(0, A4[0]); ax.set_ylim(0, A4[1])        # unidades de datos = pulgadas
+        ax.text(A4[0] / 2, A4[1] - .55, "Medidores por dimensión", ha="center", fontsize=16, fontweight="bold")
+        self.page_text = ax.text(A4[0] / 2, A4[1] - .82, "", ha="center", fontsize=10, color="#555")
+        for k, d in enumerate(inst.dim_list):
+            ax.text(self._cx(k), A4[1] - self.TOP + .08, f"{inst.dims[d]['code']}\n{textwrap.fill(d, 16)}",
+                    ha="center", va="bottom", fontsize=7, fontweight="bold")
+        colors = band_colors(inst)
+        bounds = [0, *inst.level_cuts, 100]
+        x = .6
+        for (name, _), c in zip(inst.levels, colors):
+            ax.add_patch(plt.Rectangle((x, .35), .18, .14, facecolor=c, edgecolor="#ccc", lw=.5))
+            ax.text(x + .24, .42, name, va="center", fontsize=8); x += 1.45
+        # Un trazado por banda (cuña unitaria) y el eje de la aguja; se colocan con offsets
+        paths = [Path.wedge(180 - 180 * b / 100, 180 - 180 * a / 100) for a, b in zip(bounds, bounds[1:])]
+        scale = Affine2D().scale(self.R) + self.fig.dpi_scale_trans   # cuña unitaria -> pulgadas -> píxeles
+        self.bands = PathCollection(paths, facecolors=colors, edgecolors="#ffffff", linewidths=1,
+                                    offsets=np.empty((0, 2)), offset_transform=ax.transData, transform=scale)
+        self.hubs = PathCollection([Path.unit_circle()], facecolors="#6D597A", edgecolors="none",
+                                   offsets=np.empty((0, 2)), offset_transform=ax.transData,
+                                   transform=Affine2D().scale(.03) + self.fig.dpi_scale_trans)
+        self.needles = LineCollection([], colors="#6D597A", linewidths=2.2)
+        for art in (self.bands, self.needles, self.hubs): ax.add_collection(art)
+        self.dynamic = []
+
+    def _cx(self, k): return self.LEFT + (k + .5) * self.CELL_W
+    def _cy(self, r): return A4[1] - self.TOP - (r + 1) * self.CELL_H + .25
+
+    def render(self, pdf, labels, S, rows, page, pages):
+        for t in self.dynamic: t.remove()
+        self.dynamic = []
+        nd = S.shape[1]
+        cx = np.array([self._cx(k) for k in range(nd)])
+        cy = np.array([self._cy(r) for r in range(len(rows))])
+        X, Y = np.meshgrid(cx, cy)                            # (filas × dimensiones)
+        V = np.clip(S[rows], 0, 100)
+        theta = np.pi * (1 - V / 100.0)
+        L = self.R * .95
+        self.bands.set_offsets(np.repeat(np.column_stack([X.ravel(), Y.ravel()]), len(self.bands.get_paths()), axis=0))
+        self.hubs.set_offsets(np.column_stack([X.ravel(), Y.ravel()]))
+        self.needles.set_segments(np.stack([np.column_stack([X.ravel(), Y.ravel()]),
+                                            np.column_stack([(X + L * np.cos(theta)).ravel(),
+                                                             (Y + L * np.sin(theta)).ravel()])], axis=1))
+        ax = self.ax
+        for r, i in enumerate(rows):
+            self.dynamic.append(ax.text(.35, cy[r] + .2, labels[i], va="center", fontsize=8, fontweight="bold"))
+            for k in range(nd):
+                self.dynamic.append(ax.text(cx[k], cy[r] - .17, f"{S[i, k]:.1f}", ha="center", fontsize=8))
+        self.page_text.set_text(f"Página {page} de {pages}")
+        pdf.savefig(self.fig)
+
+    def close(self):
+        plt.close(self.fig)
+
+def build_comparison_pdf(candidates:list, fecha:str, inst:Instrument=BUILTIN, sort_by:str="media")->bytes:
+    """candidates = [(etiqueta, {dimensión: puntuación})]; un PDF con todos los finalistas."""
+    labels, S = score_matrix(candidates, inst)
+    stats = rank_stats(S)
+    order = sort_order(S, stats, sort_by, inst)
+    buf = BytesIO()
+    with PdfPages(buf) as pdf:
+        _radar_page(pdf, labels, S, fecha, inst)
+        _tables_page(pdf, labels, S, stats, order, inst)
+        grid = _GaugeGrid(inst)
+        pages = math.ceil(len(order) / ROWS_PER_PAGE)
+        for p in range(pages):
+            grid.render(pdf, labels, S, order[p * ROWS_PER_PAGE:(p + 1) * ROWS_PER_PAGE], p + 1, pages)
+        grid.close()
+    buf.seek(0)
+    return buf.read()
+
+# ---------------------------------------------------------------
+# HTML (sin matplotlib): las bandas del medidor son un <symbol> reutilizado con <use>
+# ---------------------------------------------------------------
+def _svg_bands(inst:Instrument)->str:
+    bounds = [0, *inst.level_cuts, 100]
+    def pt(v):
+        t = math.pi * (1 - v / 100.0)
+        return f"{50 + 45 * math.cos(t):.2f},{50 - 45 * math.sin(t):.2f}"
+    wedges = "".join(f'<path d="M50,50 L{pt(a)} A45,45 0 0 1 {pt(b)} Z" fill="{c}" stroke="#fff"/>'
+                     for a, b, c in zip(bounds, bounds[1:], band_colors(inst)))
+    return f'<svg width="0" height="0" style="position:absolute"><defs><symbol id="bandas" viewBox="0 0 100 56">{wedges}</symbol></defs></svg>'
+
+def build_comparison_html(candidates:list, fecha:str, inst:Instrument=BUILTIN, sort_by:str="media")->bytes:
+    labels, S = score_matrix(candidates, inst)
+    stats = rank_stats(S)
+    order = sort_order(S, stats, sort_by, inst)
+    codes = [inst.dims[d]["code"] for d in inst.dim_list]
+    colors = band_colors(inst); bands = inst.level_codes(S)
+    head = "".join(f"<th>{c}</th>" for c in codes)
+    rows = ""
+    for p, i in enumerate(order, 1):
+        cells = "".join(f"<td style='background:{colors[bands[i, k]]}'>{S[i, k]:.1f} · {inst.levels[bands[i, k]][0]} "
+                        f"<small>#{stats['ranks'][i, k]}</small></td>" for k in range(len(codes)))
+        rows += (f"<tr><td>{p}</td><td>{labels[i]}</td>{cells}<td>{stats['overall'][i]:.1f}</td>"
+                 f"<td>{stats['mean_rank'][i]:.1f}</td></tr>")
+    srows = "".join(f"<tr><td>{c} {d}</td><td>{stats['mean'][k]:.1f}</td><td>{stats['std'][k]:.2f}</td>"
+                    f"<td>{stats['min'][k]:.1f}</td><td>{stats['median'][k]:.1f}</td><td>{stats['max'][k]:.1f}</td>"
+                    f"<td>{labels[stats['best'][k]]}</td></tr>" for k, (c, d) in enumerate(zip(codes, inst.dim_list)))
+    def gauge(v):
+        t = math.pi * (1 - min(max(v, 0), 100) / 100.0)
+        return (f'<svg viewBox="0 0 100 70" width="96"><use href="#bandas" width="100" height="56"/>'
+                f'<line x1="50" y1="50" x2="{50 + 42 * math.cos(t):.1f}" y2="{50 - 42 * math.sin(t):.1f}" '
+                f'stroke="#6D597A" stroke-width="3"/><text x="50" y="67" text-anchor="middle" font-size="13">{v:.1f}</text></svg>')
+    grid = "".join(f"<tr><td>{labels[i]}</td>" + "".join(f"<td>{gauge(S[i, k])}</td>" for k in range(len(codes))) + "</tr>"
+                   for i in order)
+    html = f"""<!doctype html>
+<html><head><meta charset="utf-8" />
+<title>Informe comparativo Big Five</title>
+<style>
+body{{font-family:Inter,Arial; margin:24px; color:#111;}}
+h1{{font-size:24px; margin:0 0 8px 0;}}
+h3{{font-size:18px; margin:1.2rem 0 .4rem 0;}}
+table{{border-collapse:collapse; width:100%; margin-top:8px}}
+th,td{{border:1px solid #eee; padding:6px; text-align:center; font-size:13px;}}
+</style>
+</head>
+<body>
+{_svg_bands(inst)}
+<h1>Informe comparativo Big Five — Finalistas</h1>
+<p>Fecha: <b>{fecha}</b> · {len(labels)} candidatos</p>
+<h3>Tabla ordenada</h3>
+<table><thead><tr><th>#</th><th>Candidato</th>{head}<th>Media</th><th>Puesto medio</th></tr></thead><tbody>{rows}</tbody></table>
+<h3>Estadísticos por dimensión</h3>
+<table><thead><tr><th>Dimensión</th><th>Media</th><th>DE</th><th>Mín</th><th>Mediana</th><th>Máx</th><th>Mejor</th></tr></thead><tbody>{srows}</tbody></table>
+<h3>Medidores</h3>
+<table><thead><tr><th>Candidato</th>{head}</tr></thead><tbody>{grid}</tbody></table>
+</body></html>"""
+    return html.encode("utf-8")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Informe comparativo de finalistas.")
+    ap.add_argument("--bench", action="store_true", help="Tiempo de generación para 1, 5, 10 y 20 candidatos")
+    ap.add_argument("--out", help="Escribe un informe de ejemplo con 12 candidatos sintéticos")
+    args = ap.parse_args(argv)
+    rng = np.random.default_rng(0)
+    def synthetic(n):
+        return [(f"Cand. {i+1:02d}", dict(zip(BUILTIN.dim_list, np.round(rng.uniform(10, 95, len(BUILTIN.dim_list)), 1))))
+                for i in range(n)]
+    if args.out:
+        build = build_comparison_pdf if HAS_MPL and not args.out.endswith(".html") else build_comparison_html
+        with open(args.out, "wb") as fh:
+            fh.write(build(synthetic(12), time.strftime("%d/%m/%Y %H:%M")))
+        print(f"escrito {args.out}")
+    if args.bench:
+        from bigfive import build_pdf
+        build_comparison_pdf(synthetic(2), "")  # primera vez: fuentes y backend
+        t0 = time.perf_counter(); build_pdf(synthetic(1)[0][1], ""); single = time.perf_counter() - t0
+        print(f"build_pdf individual: {single*1000:.0f} ms")
+        for n in (1, 5, 10, 20):
+            cands = synthetic(n)
+            t0 = time.perf_counter(); data = build_comparison_pdf(cands, "")
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{n:2d} candidatos: {ms:6.0f} ms ({ms/n:5.0f} ms/candidato, {len(data)/1024:.0f} KB)"
+                  f" · {n} PDF individuales ≈ {single*n*1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# ================================================================
+#  Big Five — Packs de instrumento versionados (JSON / YAML)
+#  Validación + compilación a caché binaria indexada por hash de
+#  contenido; varios instrumentos residentes y seleccionables.
+#  Uso: python instrument_packs.py validate packs/mi_pack.json
+#       python instrument_packs.py compile packs/
+#       python instrument_packs.py export-builtin > plantilla.json  (cambia id/version antes de usarla en packs/)
+# ================================================================
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+
+from bigfive import BUILTIN, BUILTIN_PACK, DIMENSIONES, Instrument
+
+# YAML es opcional: sin PyYAML solo se aceptan packs JSON.
+HAS_YAML = False
+try:
+    import yaml
+    HAS_YAML = True
+except Exception:
+    HAS_YAML = False
+
+PACK_FORMAT = 1
+# Cambia si cambia la estructura de Instrument: invalida todas las cachés previas.
+COMPILER_VERSION = "1"
+PACK_EXTS = (".json", ".yaml", ".yml")
+NARRATIVE_LISTS = ("fort_high", "risk_high", "fort_low", "risk_low", "recs_low", "roles_high", "roles_low")
+OCEAN_CODES = {ds["code"] for ds in DIMENSIONES.values()}
+
+class PackError(ValueError):
+    """Pack inválido; `problems` lista todos los errores encontrados."""
+    def __init__(self, source:str, problems:list):
+        super().__init__(f"{source}: " + "; ".join(problems))
+        self.problems = problems
+
+# ---------------------------------------------------------------
+# Lectura y validación
+# ---------------------------------------------------------------
+def parse_pack(raw:bytes, source:str)->dict:
+    if source.endswith((".yaml", ".yml")):
+        if not HAS_YAML: raise PackError(source, ["instala PyYAML para leer packs YAML"])
+        try:
+            return yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise PackError(source, [f"YAML inválido: {e}"])
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        raise PackError(source, [f"JSON inválido: {e}"])
+
+def _str_list(x)->bool:
+    return isinstance(x, list) and all(isinstance(s, str) for s in x)
+
+def _num_list(x)->bool:
+    return isinstance(x, (list, tuple)) and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in x)
+
+def _name_pairs(x)->bool:
+    """level_names: [[nivel, etiqueta], ...] (lo que desempaqueta level_label)."""
+    return isinstance(x, (list, tuple)) and all(isinstance(n, (list, tuple)) and len(n) == 2 and
+                                                all(isinstance(s, str) for s in n) for n in x)
+
+def validate_pack(pack, source:str="pack")->dict:
+    p = []
+    if not isinstance(pack, dict): raise PackError(source, ["el pack debe ser un objeto"])
+    if pack.get("format", PACK_FORMAT) != PACK_FORMAT: p.append(f"format no soportado: {pack.get('format')}")
+    for k in ("id", "version", "likert", "dimensions", "items"):
+        if k not in pack: p.append(f"falta '{k}'")
+    if p: raise PackError(source, p)
+    for k in ("id", "version"):
+        if not isinstance(pack[k], str) or not pack[k].strip(): p.append(f"'{k}' debe ser un texto no vacío")
+    if not isinstance(pack.get("name", ""), str): p.append("'name' debe ser un texto")
+
+    try:
+        scale = sorted(int(k) for k in pack["likert"]) if isinstance(pack["likert"], dict) else []
+    except (TypeError, ValueError):
+        scale = []
+    if isinstance(pack["likert"], dict) and not all(isinstance(v, str) for v in pack["likert"].values()):
+        p.append("las etiquetas de likert deben ser textos")
+    if len(scale) < 2 or scale != list(range(1, len(scale) + 1)) or len(scale) > 11:
+        p.append("likert debe tener claves enteras consecutivas desde 1 (2 a 11 opciones)")
+
+    dims = pack["dimensions"]
+    if not isinstance(dims, dict) or not dims:
+        raise PackError(source, p + ["dimensions debe ser un objeto no vacío"])
+    codes = [ds.get("code") for ds in dims.values() if isinstance(ds, dict)]
+    if not all(isinstance(c, str) for c in codes) or sorted(codes) != sorted(OCEAN_CODES):
+        p.append(f"las dimensiones deben usar exactamente los códigos {sorted(OCEAN_CODES)}")
+    for d, ds in dims.items():
+        if not isinstance(ds, dict): p.append(f"dimensión '{d}' debe ser un objeto"); continue
+        for k in ("desc", "color", "icon"):
+            if not isinstance(ds.get(k), str): p.append(f"{d}: falta '{k}'")
+        for k in NARRATIVE_LISTS:
+            if not _str_list(ds.get(k)): p.append(f"{d}: '{k}' debe ser una lista de textos")
+        for k in ("no_apt_high", "no_apt_low"):
+            if k in ds and not _str_list(ds[k]): p.append(f"{d}: '{k}' debe ser una lista de textos")
+
+    items = pack["items"]
+    if not isinstance(items, list) or not items:
+        raise PackError(source, p + ["items debe ser una lista no vacía"])
+    seen, per_dim = set(), {d: 0 for d in dims}
+    for i, q in enumerate(items):
+        if not isinstance(q, dict) or not isinstance(q.get("text"), str) or not isinstance(q.get("key"), str):
+            p.append(f"ítem #{i+1}: requiere 'text' y 'key'"); continue
+        if q["key"] in seen: p.append(f"clave de ítem repetida: {q['key']}")
+        seen.add(q["key"])
+        if not isinstance(q.get("dim"), str) or q["dim"] not in dims: p.append(f"{q['key']}: dimensión desconocida {q.get('dim')!r}")
+        else: per_dim[q["dim"]] += 1
+        if not isinstance(q.get("rev"), bool): p.append(f"{q['key']}: 'rev' debe ser true/false")
+    p += [f"la dimensión '{d}' no tiene ítems" for d, n in per_dim.items() if n == 0]
+
+    th = pack.get("thresholds", {})
+    if not isinstance(th, dict):
+        p.append("thresholds debe ser un objeto"); th = {}
+    levels = th.get("levels", BUILTIN.level_cuts); names = th.get("level_names", BUILTIN.levels)
+    if not _num_list(levels) or list(levels) != sorted(levels):
+        p.append("thresholds.levels debe ser una lista creciente de números")
+    if not _name_pairs(names):
+        p.append("thresholds.level_names debe ser una lista de pares [nivel, etiqueta]")
+    elif _num_list(levels) and len(names) != len(levels) + 1:
+        p.append("thresholds.levels debe tener un corte menos que level_names")
+    prof = th.get("profile", BUILTIN.profile_cuts)
+    if not _num_list(prof) or len(prof) != 2 or not prof[0] <= prof[1]:
+        p.append("thresholds.profile debe ser [corte_bajo, corte_alto]")
+    texts = pack.get("profile_texts", BUILTIN.profile_texts)
+    required = {"high": ("fort_extra", "risk_extra", "recs"), "low": ("fort_extra", "risk_extra", "recs_extra"),
+                "mid": ("fort", "risk", "recs")}
+    for band, keys in required.items():
+        t = texts.get(band) if isinstance(texts, dict) else None
+        if not isinstance(t, dict) or not isinstance(t.get("expl"), str) or not all(_str_list(t.get(k)) for k in keys):
+            p.append(f"profile_texts.{band} requiere {', '.join(keys)} y expl")
+    if p: raise PackError(source, p)
+    return pack
+
+# ---------------------------------------------------------------
+# Compilación con caché binaria (clave = hash del contenido)
+# ---------------------------------------------------------------
+def content_hash(raw:bytes)->str:
+    return hashlib.sha256(COMPILER_VERSION.encode() + b"\0" + raw).hexdigest()
+
+def compile_pack(raw:bytes, source:str)->Instrument:
+    pack = validate_pack(parse_pack(raw, source), source)
+    return Instrument({**pack, "content_hash": content_hash(raw)})
+
+def load_compiled(path:str, cache_dir:str)->Instrument:
+    """Instrumento desde la caché si el contenido no cambió; si no, valida, compila y guarda."""
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    h = content_hash(raw)
+    cached = os.path.join(cache_dir, f"{h}.pickle")
+    if os.path.exists(cached):
+        try:
+            with open(cached, "rb") as fh:
+                return pickle.load(fh)
+        except Exception:
+            pass  # caché corrupta o de otra versión de numpy: se recompila
+    inst = compile_pack(raw, path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump(inst, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cached)
+    return inst
+
+class InstrumentRegistry:
+    """Instrumentos residentes en memoria, indexados por 'id@version'."""
+    def __init__(self, packs_dir:str|None=None, cache_dir:str|None=None):
+        self.packs_dir = packs_dir
+        self.cache_dir = cache_dir or os.environ.get("BIGFIVE_CACHE_DIR", os.path.join(".cache", "instrumentos"))
+        self.instruments = {BUILTIN.key: BUILTIN}
+        self.errors = {}  # archivo -> PackError
+        self.lock = threading.Lock()
+        if packs_dir: self.refresh()
+
+    def refresh(self):
+        if not self.packs_dir or not os.path.isdir(self.packs_dir): return
+        loaded, errors, sources = {BUILTIN.key: BUILTIN}, {}, {}
+        for name in sorted(os.listdir(self.packs_dir)):
+            if not name.endswith(PACK_EXTS): continue
+            path = os.path.join(self.packs_dir, name)
+            try:
+                inst = load_compiled(path, self.cache_dir)
+            except PackError as e:
+                errors[path] = e; continue
+            except Exception as e:  # un pack roto nunca debe tumbar el registro (ni la app)
+                errors[path] = PackError(path, [f"error inesperado: {e!r}"]); continue
+            # Nunca se sobrescribe: el instrumento por defecto (telemetría y archivo asumen sus
+            # 50 ítems bajo su clave) ni otro pack ya cargado con el mismo id@version
+            if inst.key == BUILTIN.key:
+                errors[path] = PackError(path, [f"{inst.key} es la clave del instrumento por defecto; "
+                                                "usa otro id o version"]); continue
+            if inst.key in loaded:
+                errors[path] = PackError(path, [f"{inst.key} ya lo define {sources[inst.key]}"]); continue
+            loaded[inst.key] = inst; sources[inst.key] = path
+        with self.lock:
+            self.instruments, self.errors = loaded, errors
+
+    def get(self, key:str|None)->Instrument:
+        return self.instruments.get(key or BUILTIN.key, BUILTIN)
+
+    def options(self)->dict:
+        """{clave: nombre visible} para un selector."""
+        return {k: f"{i.name} · v{i.version}" for k, i in self.instruments.items()}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Packs de instrumento Big Five.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    v = sub.add_parser("validate"); v.add_argument("paths", nargs="+")
+    c = sub.add_parser("compile"); c.add_argument("packs_dir"); c.add_argument("--cache-dir")
+    sub.add_parser("export-builtin")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export-builtin":
+        json.dump(BUILTIN_PACK, sys.stdout, ensure_ascii=False, indent=2); print()
+        return
+    if args.cmd == "validate":
+        ok = True
+        for path in args.paths:
+            try:
+                with open(path, "rb") as fh:
+                    inst = compile_pack(fh.read(), path)
+                print(f"OK  {path}: {inst.key} · {len(inst.questions)} ítems · {len(inst.dim_list)} dimensiones")
+            except (PackError, ValueError) as e:
+                ok = False; print(f"ERR {e}")
+        sys.exit(0 if ok else 1)
+    reg = InstrumentRegistry(args.packs_dir, args.cache_dir)
+    for key, inst in reg.instruments.items():
+        print(f"OK  {key} · {inst.content_hash[:12] or 'integrado'}")
+    for path, e in reg.errors.items():
+        print(f"ERR {e}")
+    sys.exit(1 if reg.errors else 0)
+
+if __name__ == "__main__":
+    main()
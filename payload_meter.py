@@ -0,0 +1,109 @@
+# ================================================================
+#  Big Five — Medición de lo enviado al navegador en cada rerun
+#  Intercepta la cola de ForwardMsg de la sesión (después de la caché
+#  de mensajes de Streamlit) y cuenta mensajes, elementos y bytes por
+#  rerun; los reruns terminados se agregan por etapa para todo el proceso.
+# ================================================================
+import threading
+from collections import deque
+
+_disabled = ""   # motivo del fallo del gancho; vacío = medición activa
+
+class StageStats:
+    """Agregados por etapa (p. ej. 'resultados · consolidado') compartidos por todas las sesiones."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}   # etapa -> {"reruns", "msgs", "elements", "bytes", "refs", "cacheable"}
+
+    def add(self, run:dict):
+        with self.lock:
+            s = self.stages.setdefault(run["stage"], {"reruns": 0, "msgs": 0, "elements": 0, "bytes": 0,
+                                                      "refs": 0, "cacheable": 0})
+            s["reruns"] += 1
+            for k in ("msgs", "elements", "bytes", "refs", "cacheable"): s[k] += run[k]
+
+    def extend(self, stage:str, delta:dict):
+        """Suma a una etapa mensajes llegados después de cerrar su rerun (no cuenta un rerun más)."""
+        with self.lock:
+            s = self.stages.get(stage)
+            if s is None: return
+            for k, v in delta.items(): s[k] += v
+
+    def rows(self)->list:
+        """[{etapa, reruns, medias por rerun}] ordenado por etapa."""
+        with self.lock:
+            return [{"stage": k, "reruns": s["reruns"],
+                     **{k2: s[k2] / s["reruns"] for k2 in ("msgs", "elements", "bytes", "refs", "cacheable")}}
+                    for k, s in sorted(self.stages.items())]
+
+class RerunMeter:
+    """Contadores del rerun en curso y los últimos `history` reruns de una sesión.
+
+    `bytes` es el tamaño serializado de lo que realmente se encola (una referencia
+    de caché cuenta solo su hash); `cacheable` son los bytes de elementos que el
+    navegador puede reutilizar de su caché en el siguiente rerun.
+    """
+    def __init__(self, stats:StageStats|None=None, history:int=50):
+        self.stats = stats
+        self.runs = deque(maxlen=history)
+        self.current = None
+        self.closed = None   # rerun cerrado por finish() que aún recibe la cola del script (page_profile)
+
+    def begin(self, stage:str):
+        self.finish()
+        self.closed = None
+        self.current = {"stage": stage, "msgs": 0, "elements": 0, "bytes": 0, "refs": 0, "cacheable": 0}
+
+    def finish(self):
+        """Cierra el rerun en curso; la app lo llama al final del script porque el último
+        rerun de la sesión no tiene un begin() siguiente que lo cierre."""
+        run, self.current = self.current, None
+        if run is None or run["msgs"] == 0: return
+        self.runs.append(run); self.closed = run
+        if self.stats is not None: self.stats.add(run)
+
+    def observe(self, msg):
+        size = msg.ByteSize()
+        delta = {"msgs": 1, "bytes": size}
+        kind = msg.WhichOneof("type")
+        if kind == "ref_hash":
+            delta["refs"] = 1; delta["elements"] = 1
+        elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            delta["elements"] = 1
+            if msg.metadata.cacheable: delta["cacheable"] = size
+        run = self.current or self.closed
+        if run is None: return
+        for k, v in delta.items(): run[k] += v
+        if run is self.closed and self.stats is not None: self.stats.extend(run["stage"], delta)
+
+def install(ctx, meter:RerunMeter)->bool:
+    """Engancha `meter` a la cola de mensajes del ScriptRunContext (idempotente por contexto).
+
+    `_enqueue` es interno de Streamlit: si falta o el gancho falla, la medición se
+    desactiva para el proceso y la app sigue enviando sus mensajes sin medir.
+    """
+    global _disabled
+    if _disabled or ctx is None: return False
+    if getattr(ctx, "_medidor", None) is meter: return True
+    try:
+        enqueue = getattr(ctx, "_enqueue_original", None) or ctx._enqueue
+        if not callable(enqueue): raise TypeError(f"_enqueue no es invocable: {enqueue!r}")
+        def metered(msg):
+            global _disabled
+            if not _disabled:
+                try:
+                    meter.observe(msg)
+                except Exception as e:  # la medición nunca debe impedir el envío
+                    _disabled = repr(e)
+            enqueue(msg)
+        ctx._enqueue_original = enqueue
+        ctx._enqueue = metered
+        ctx._medidor = meter
+    except Exception as e:
+        _disabled = repr(e)
+        return False
+    return True
+
+def disabled()->str|None:
+    """Motivo por el que la medición se desactivó en este proceso (None si está activa)."""
+    return _disabled or None
@@ -0,0 +1,141 @@
+# ================================================================
+#  Big Five — Almacén en disco para los informes descargables
+#  Los bytes del PDF/HTML viven en disco (uno por hash de contenido),
+#  con tope global de tamaño, expiración por TTL y contabilidad por
+#  sesión; en memoria solo quedan metadatos.
+# ================================================================
+import hashlib
+import os
+import threading
+import time
+
+class PayloadStore:
+    """Informes deduplicados por SHA-256 en `root`, con tope `max_bytes` y TTL en segundos.
+
+    Cada entrada recuerda qué sesiones la referencian; el tope se aplica expulsando
+    primero lo caducado y después lo menos usado recientemente (LRU). La caducidad se
+    revisa en put, get y metrics; una sesión sin actividad durante el TTL se libera
+    (quien cierra el navegador nunca pulsa «Nueva evaluación»).
+    """
+    def __init__(self, root:str, max_bytes:int=256 * 2**20, ttl:float=3600.0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}    # hash -> {"size", "ext", "last", "sessions"}
+        self.seen = {}       # sesión -> último put/get
+        self.total = 0
+        self.stats = {"puts": 0, "dedup": 0, "reads": 0, "read_bytes": 0, "evicted": 0, "evicted_bytes": 0}
+        os.makedirs(root, exist_ok=True)
+        # Lo que quedó de una ejecución anterior cuenta para el tope (sin sesiones)
+        for name in os.listdir(root):
+            h, ext = os.path.splitext(name)
+            if len(h) != 64 or ext.endswith(".tmp"): continue
+            info = os.stat(os.path.join(root, name))
+            self.entries[h] = {"size": info.st_size, "ext": ext, "last": info.st_mtime, "sessions": set()}
+            self.total += info.st_size
+        self.evict()
+
+    def _path(self, h:str, ext:str)->str:
+        return os.path.join(self.root, h + ext)
+
+    def put(self, data:bytes, session:str="", ext:str="")->str:
+        """Guarda `data` (si no existía) y la asocia a `session`. Devuelve el hash."""
+        h = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            self.stats["puts"] += 1
+            e = self.entries.get(h)
+            if e is None:
+                path = self._path(h, ext)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp, path)
+                e = self.entries[h] = {"size": len(data), "ext": ext, "last": 0.0, "sessions": set()}
+                self.total += len(data)
+            else:
+                self.stats["dedup"] += 1
+            e["last"] = time.time()
+            if session:
+                e["sessions"].add(session); self.seen[session] = e["last"]
+            self._evict_locked(keep=h)
+        return h
+
+    def contains(self, h:str|None)->bool:
+        with self.lock:
+            return h in self.entries and not self._expired(self.entries[h], time.time())
+
+    def get(self, h:str, session:str="")->bytes|None:
+        """Bytes de la entrada o None si ya fue expulsada o caducó; renueva su TTL."""
+        with self.lock:
+            self._evict_locked()
+            e = self.entries.get(h)
+            if e is None: return None
+            e["last"] = time.time()
+            if session: self.seen[session] = e["last"]
+            path = self._path(h, e["ext"])
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            with self.lock:
+                self._drop(h)
+            return None
+        with self.lock:
+            self.stats["reads"] += 1; self.stats["read_bytes"] += len(data)
+        return data
+
+    def release(self, session:str):
+        """La sesión ya no necesita sus informes; quedan hasta el TTL por si otra los comparte."""
+        with self.lock:
+            self._release_locked(session)
+
+    def _release_locked(self, session:str):
+        self.seen.pop(session, None)
+        for e in self.entries.values():
+            e["sessions"].discard(session)
+
+    # -----------------------------------------------------------
+    # Expulsión
+    # -----------------------------------------------------------
+    def _expired(self, e:dict, now:float)->bool:
+        return now - e["last"] > self.ttl
+
+    def _drop(self, h:str):
+        e = self.entries.pop(h, None)
+        if e is None: return
+        self.total -= e["size"]
+        self.stats["evicted"] += 1; self.stats["evicted_bytes"] += e["size"]
+        try:
+            os.remove(self._path(h, e["ext"]))
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self, keep:str|None=None):
+        now = time.time()
+        for s in [s for s, t in self.seen.items() if now - t > self.ttl]:
+            self._release_locked(s)
+        for h in [h for h, e in self.entries.items() if h != keep and self._expired(e, now)]:
+            self._drop(h)
+        if self.total <= self.max_bytes: return
+        for h in sorted(self.entries, key=lambda h: self.entries[h]["last"]):
+            if self.total <= self.max_bytes: break
+            if h != keep: self._drop(h)
+
+    def evict(self):
+        with self.lock:
+            self._evict_locked()
+
+    # -----------------------------------------------------------
+    # Métricas
+    # -----------------------------------------------------------
+    def metrics(self)->dict:
+        """Totales del proceso y bytes referenciados por cada sesión (compartidos cuentan en ambas)."""
+        with self.lock:
+            self._evict_locked()
+            per_session = {}
+            for e in self.entries.values():
+                for s in e["sessions"]:
+                    per_session[s] = per_session.get(s, 0) + e["size"]
+            return {"bytes": self.total, "files": len(self.entries), "max_bytes": self.max_bytes,
+                    "ttl": self.ttl, "sessions": per_session, **self.stats}
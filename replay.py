@@ -0,0 +1,205 @@
+# ================================================================
+#  Big Five — Reproducción de sesiones grabadas bajo un perfilador
+#  Re-ejecuta los eventos de session_recorder.py con AppTest (sin
+#  navegador) mientras un perfilador por muestreo toma las pilas de
+#  todos los hilos; escribe pilas colapsadas (flamegraph.pl/speedscope)
+#  y resume los puntos calientes de view_resultados y build_pdf.
+#  Uso: python replay.py grabaciones/20261019-101500-ab12cd34.jsonl --out perfil
+# ================================================================
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+IDLE_FILES = ("threading.py", "queue.py", "selectors.py")   # hilos esperando: no cuentan
+IDLE_FUNCS = ("require_widgets_deltas",)                    # AppTest esperando al hilo del script
+FOCUS = ("view_resultados", "build_pdf")
+
+# ---------------------------------------------------------------
+# Perfilador por muestreo (cubre el hilo del script de AppTest)
+# ---------------------------------------------------------------
+class StackSampler:
+    """Cada `interval` s toma la pila de cada hilo ocupado y la cuenta bajo la etiqueta actual.
+
+    cProfile solo ve el hilo que lo activa y AppTest ejecuta el script en otro hilo;
+    el muestreo con sys._current_frames ve ambos con un costo acotado por muestra.
+    """
+    def __init__(self, interval:float=0.001):
+        self.interval = interval
+        self.counts = Counter()     # (etiqueta, (marco raíz, ..., hoja)) -> muestras
+        self.label = "arranque"
+        self.names = {}             # code -> "función (archivo:línea)"
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch = None
+
+    def _name(self, code)->str:
+        name = self.names.get(code)
+        if name is None:
+            name = self.names[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return name
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            label = self.label
+            for tid, frame in sys._current_frames().items():
+                if (tid == me or frame.f_code.co_name in IDLE_FUNCS
+                        or os.path.basename(frame.f_code.co_filename) in IDLE_FILES): continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._name(frame.f_code)); frame = frame.f_back
+                self.counts[(label, tuple(reversed(stack)))] += 1
+
+    def start(self):
+        self._switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch, self.interval / 2))  # que el muestreador obtenga el GIL a tiempo
+        self._thread = threading.Thread(target=self._run, name="bigfive-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set(); self._thread.join()
+        sys.setswitchinterval(self._switch)
+
+    def folded(self)->str:
+        """Formato de pilas colapsadas: 'etiqueta;raíz;...;hoja muestras' por línea."""
+        return "".join(f"{label};{';'.join(stack)} {n}\n" for (label, stack), n in sorted(self.counts.items()))
+
+    def by_label(self)->Counter:
+        out = Counter()
+        for (label, _), n in self.counts.items(): out[label] += n
+        return out
+
+    def hot(self, focus:str|None=None, top:int=15)->list:
+        """[(función, propias, inclusivas)] ordenado por muestras propias; con `focus`, solo
+        pilas que pasan por esa función y contando desde ella hacia las hojas."""
+        incl, own = Counter(), Counter()
+        for (_, stack), n in self.counts.items():
+            if focus is not None:
+                at = next((i for i, f in enumerate(stack) if f.startswith(focus + " (")), None)
+                if at is None: continue
+                stack = stack[at:]
+            for f in set(stack): incl[f] += n
+            own[stack[-1]] += n
+        return [(f, n, incl[f]) for f, n in own.most_common(top)]
+
+# ---------------------------------------------------------------
+# Reproducción
+# ---------------------------------------------------------------
+def find_button(at, text:str):
+    for b in at.button:
+        if text in b.label: return b
+    raise LookupError(f"no hay botón «{text}» en la etapa {at.session_state.stage}")
+
+def export_report(at, fmt:str)->int:
+    """La descarga diferida sin caché: el informe se reconstruye (el peor caso, TTL expirado)."""
+    from bigfive import build_pdf, build_html
+    from instrument_packs import InstrumentRegistry
+    inst = InstrumentRegistry(os.environ.get("BIGFIVE_PACKS_DIR", "packs")).get(at.session_state.instrumento)
+    res = inst.compute_scores(at.session_state.answers)
+    return len((build_pdf if fmt == "pdf" else build_html)(res, at.session_state.fecha, inst))
+
+def replay(events:list, sampler:StackSampler|None=None, timeout:float=300)->list:
+    """Ejecuta los eventos en orden; devuelve [{i, ev, detalle, ms, grabado_ms, etapa, aviso}]."""
+    from streamlit.testing.v1 import AppTest
+    start = events[0]
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    for k, v in start.get("q", {}).items(): at.query_params[k] = v
+    rows, fresh = [], False   # fresh: la última acción ya produjo la vista que se grabó a continuación
+
+    def step(i, ev, detail, action, recorded=None):
+        if sampler is not None: sampler.label = f"{i:03d}-{ev}"
+        t0 = time.perf_counter()
+        action()
+        ms = (time.perf_counter() - t0) * 1000
+        if at.exception: raise RuntimeError(f"evento {i} ({ev}): {at.exception[0].message}")
+        rows.append({"i": i, "ev": ev, "detalle": detail, "ms": ms, "grabado_ms": recorded,
+                     "etapa": at.session_state.stage if "stage" in at.session_state else "-", "aviso": ""})
+
+    step(0, "inicio", " ".join(f"{k}={v}" for k, v in start.get("q", {}).items()), at.run)
+    fresh = True
+    for i, e in enumerate(events[1:], 1):
+        ev = e["ev"]
+        if ev == "iniciar":
+            def action(e=e):
+                if "instrumento_sel" in at.session_state: at.selectbox(key="instrumento_sel").set_value(e["inst"])
+                at.text_input[0].set_value(e.get("area", ""))
+                find_button(at, "Iniciar evaluación").click().run()
+            step(i, ev, e["inst"], action); fresh = True
+        elif ev == "respuesta":
+            step(i, ev, f"{e['k']}={e['r']}", lambda e=e: at.radio(key=f"resp_{e['k']}").set_value(e["r"]).run())
+            fresh = True
+        elif ev == "nueva":
+            step(i, ev, "", lambda: find_button(at, "Nueva evaluación").click().run()); fresh = True
+        elif ev == "exportar":
+            step(i, ev, e["fmt"], lambda e=e: export_report(at, e["fmt"]))
+        elif ev == "vista":
+            if fresh:   # ya medida dentro de la acción anterior: se anota la duración grabada
+                for r in reversed(rows):
+                    if r["ev"] != "exportar": r["grabado_ms"] = (r["grabado_ms"] or 0) + e["ms"]; break
+                fresh = bool(e.get("sigue"))
+            else:       # rerun sin acción reproducible (recarga, clic de descarga)
+                step(i, "rerun", "", at.run, e["ms"])
+        elif ev == "etapa":
+            if rows and rows[-1]["etapa"] != e["a"] and e["a"] != "cohorte":
+                rows[-1]["aviso"] = f"grabado: {e['a']}"
+    return rows
+
+def main(argv=None):
+    # Antes de importar nada de la app: la reproducción no debe grabarse a sí misma
+    os.environ["BIGFIVE_RECORD_DIR"] = ""
+    from session_recorder import load_events
+    ap = argparse.ArgumentParser(description="Reproduce una sesión grabada bajo un perfilador por muestreo.")
+    ap.add_argument("grabacion", help="Archivo .jsonl de BIGFIVE_RECORD_DIR")
+    ap.add_argument("--out", help="Prefijo de salida: escribe <out>.folded (pilas colapsadas)")
+    ap.add_argument("--interval", type=float, default=1.0, help="Milisegundos entre muestras")
+    ap.add_argument("--focus", action="append", help=f"Funciones a desglosar (por defecto {', '.join(FOCUS)})")
+    ap.add_argument("--top", type=int, default=12)
+    ap.add_argument("--warmup", default="off", help="BIGFIVE_WARMUP para la reproducción (off = determinista)")
+    ap.add_argument("--no-profile", action="store_true", help="Solo tiempos por evento")
+    args = ap.parse_args(argv)
+
+    events = load_events(args.grabacion)
+    start = events[0]
+    # Estado aislado: la reproducción no toca la cohorte ni los informes reales
+    os.environ.update({"BIGFIVE_DATA_DIR": tempfile.mkdtemp(prefix="replay-data-"),
+                       "BIGFIVE_PAYLOAD_DIR": tempfile.mkdtemp(prefix="replay-informes-"),
+                       "BIGFIVE_WARMUP": args.warmup,
+                       "BIGFIVE_RENDER": start.get("render", "consolidado")})
+    sampler = None if args.no_profile else StackSampler(args.interval / 1000)
+    if sampler: sampler.start()
+    try:
+        rows = replay(events, sampler)
+    finally:
+        if sampler: sampler.stop()
+
+    print(f"{args.grabacion}: {len(events)} eventos · render {start.get('render')} · warmup {args.warmup}")
+    per_label = sampler.by_label() if sampler else Counter()
+    print(f"{'#':>4s}  {'evento':10s} {'detalle':18s} {'ms':>8s} {'grabado':>8s} {'muestras':>8s}  etapa")
+    for r in rows:
+        rec = "" if r["grabado_ms"] is None else f"{r['grabado_ms']:.0f}"
+        n = per_label.get(f"{r['i']:03d}-{r['ev']}", 0)
+        print(f"{r['i']:4d}  {r['ev']:10s} {r['detalle'][:18]:18s} {r['ms']:8.1f} {rec:>8s} {n:8d}  {r['etapa']}"
+              + (f"  ⚠ {r['aviso']}" if r["aviso"] else ""))
+    slow = sorted(rows, key=lambda r: -r["ms"])[:3]
+    print("más lentos: " + ", ".join(f"#{r['i']} {r['ev']} {r['ms']:.0f} ms" for r in slow))
+    if not sampler: return
+
+    ms_per = args.interval
+    for focus in [None, *(args.focus or FOCUS)]:
+        hot = sampler.hot(focus, args.top)
+        if not hot: continue
+        print(f"\n{'Todo el replay' if focus is None else focus} — muestras de {ms_per:g} ms (propias / inclusivas)")
+        for f, own, n in hot:
+            print(f"  {own:7d} {n:7d}  {f}")
+    if args.out:
+        with open(args.out + ".folded", "w", encoding="utf-8") as fh:
+            fh.write(sampler.folded())
+        print(f"\npilas colapsadas en {args.out}.folded (flamegraph.pl o https://www.speedscope.app)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# ================================================================
+#  Big Five — Índice de ajuste a roles sobre el pool de candidatos
+#  Perfiles objetivo derivados de roles_high/roles_low de DIMENSIONES
+#  y consultas top-k vectorizadas sobre la matriz (N × 5).
+#  Uso: python role_fit.py "Ventas" -k 10        (datos guardados)
+#       python role_fit.py --bench 1000000        (pool sintético)
+# ================================================================
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from bigfive import DIMENSIONES, DIM_LIST, LEVELS, level_codes
+from cohort import iter_results
+
+# Objetivo 0–100 por dimensión y peso relativo en la distancia
+DEFAULT_WEIGHTS = {
+    "high_target": 80.0,     # dimensión donde el rol figura en roles_high
+    "low_target": 20.0,      # dimensión donde el rol figura en roles_low
+    "neutral_target": 50.0,  # dimensión que no menciona el rol
+    "listed_weight": 1.0,
+    "neutral_weight": 0.25,
+}
+
+def role_profiles(weights:dict|None=None)->dict:
+    """{rol: (objetivo[5], pesos[5])} en el orden de DIM_LIST."""
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    roles = {}
+    for j, d in enumerate(DIM_LIST):
+        for side, target in (("roles_high", w["high_target"]), ("roles_low", w["low_target"])):
+            for role in DIMENSIONES[d][side]:
+                t, wt = roles.setdefault(role, (np.full(len(DIM_LIST), w["neutral_target"]),
+                                                np.full(len(DIM_LIST), w["neutral_weight"])))
+                t[j] = target; wt[j] = w["listed_weight"]
+    return roles
+
+def band_filter_codes(bands:dict)->dict:
+    """{dimensión o código: ["Alto", "Muy Alto"]} -> {índice de dimensión: códigos de banda}."""
+    by_code = {DIMENSIONES[d]["code"]: j for j, d in enumerate(DIM_LIST)}
+    names = [lvl for lvl, _ in LEVELS]
+    out = {}
+    for dim, allowed in bands.items():
+        j = by_code[dim] if dim in by_code else DIM_LIST.index(dim)
+        out[j] = np.array([names.index(a) for a in allowed], dtype=np.int8)
+    return out
+
+class RoleFitIndex:
+    """Pool de candidatos en memoria, en columnas float32 con crecimiento amortizado.
+
+    La distancia ponderada se expande como S²·w − 2·S·(w·t) + Σw·t²: con S² y S
+    guardados como filas contiguas (10 × N), cada consulta es un único producto
+    vector-matriz seguido de un argpartition.
+
+    Es compartido entre sesiones: `add` se serializa con un lock y `top_k` trabaja
+    sobre una instantánea (n, columnas) tomada bajo el mismo lock; las filas ya
+    publicadas nunca se reescriben, así que la consulta no necesita retenerlo.
+    """
+    def __init__(self, capacity:int=1024):
+        self.n = 0
+        self.ids = np.empty(capacity, dtype=object)
+        self.cols = np.empty((2 * len(DIM_LIST), capacity), dtype=np.float32)  # [S²; S]
+        self.bands = np.empty((len(DIM_LIST), capacity), dtype=np.int8)
+        self.profiles = role_profiles()
+        self.lock = threading.Lock()
+
+    def _reserve(self, n:int):
+        """Llamar con self.lock tomado."""
+        cap = len(self.ids)
+        if n <= cap: return
+        while cap < n: cap *= 2
+        ids = np.empty(cap, dtype=object); ids[:self.n] = self.ids[:self.n]; self.ids = ids
+        for name in ("cols", "bands"):
+            old = getattr(self, name)
+            new = np.empty((old.shape[0], cap), dtype=old.dtype)
+            new[:, :self.n] = old[:, :self.n]
+            setattr(self, name, new)
+
+    def add(self, ids, scores):
+        scores = np.asarray(scores, dtype=np.float32).reshape(-1, len(DIM_LIST))
+        ids, codes, nd = list(ids), level_codes(scores).T, len(DIM_LIST)
+        with self.lock:
+            a, b = self.n, self.n + len(scores)
+            self._reserve(b)
+            self.ids[a:b] = ids
+            self.cols[:nd, a:b] = (scores * scores).T
+            self.cols[nd:, a:b] = scores.T
+            self.bands[:, a:b] = codes
+            self.n = b
+
+    def _snapshot(self):
+        with self.lock:
+            return self.n, self.ids, self.cols, self.bands
+
+    def scores(self, i:int, cols:np.ndarray|None=None)->dict:
+        cols = self.cols if cols is None else cols
+        return {d: round(float(v), 1) for d, v in zip(DIM_LIST, cols[len(DIM_LIST):, i])}
+
+    def set_weights(self, weights:dict):
+        self.profiles = role_profiles(weights)
+
+    def top_k(self, role:str, k:int=10, bands:dict|None=None)->list:
+        """Los k candidatos más cercanos al perfil del rol: [(id, ajuste 0–100, puntuaciones)]."""
+        n, ids, cols, band_cols = self._snapshot()
+        if n == 0: return []
+        target, w = self.profiles[role]
+        v = np.concatenate([w, -2.0 * w * target]).astype(np.float32)
+        dist = v @ cols[:, :n] + np.float32(w @ (target * target))
+        if bands:
+            mask = np.ones(n, dtype=bool)
+            for j, codes in band_filter_codes(bands).items():
+                allowed = np.zeros(len(LEVELS), dtype=bool); allowed[codes] = True
+                mask &= allowed[band_cols[j, :n]]
+            np.putmask(dist, ~mask, np.inf)
+        k = min(k, n)
+        top = np.argpartition(dist, k - 1)[:k]
+        top = top[np.argsort(dist[top], kind="stable")]
+        top = top[np.isfinite(dist[top])]
+        # Ajuste 0–100 respecto de la peor distancia posible para este rol
+        worst = float(w @ np.maximum(target, 100 - target) ** 2)
+        fit = 100.0 * (1.0 - np.sqrt(np.maximum(dist[top], 0) / worst))
+        return [(ids[i], round(float(f), 1), self.scores(i, cols)) for i, f in zip(top, fit)]
+
+    @classmethod
+    def from_results(cls, results_path:str):
+        """Construye el índice desde el JSONL de resultados (ver cohort.CohortStore)."""
+        index = cls()
+        ids, rows = [], []
+        for row, _ in iter_results(results_path):
+            ids.append(row["id"]); rows.append([row["scores"][d] for d in DIM_LIST])
+        if rows: index.add(ids, rows)
+        return index
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Ranking de candidatos por ajuste a un rol.")
+    ap.add_argument("role", nargs="?", help="Rol tal como figura en DIMENSIONES (roles_high/roles_low)")
+    ap.add_argument("-k", type=int, default=10)
+    ap.add_argument("--data-dir", default=os.environ.get("BIGFIVE_DATA_DIR", "data"))
+    ap.add_argument("--band", action="append", default=[], metavar="DIM=Nivel[,Nivel]",
+                    help='Filtro de banda, p. ej. --band "C=Alto,Muy Alto"')
+    ap.add_argument("--bench", type=int, default=0, metavar="N", help="Pool sintético de N candidatos")
+    ap.add_argument("--list-roles", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.list_roles:
+        for role, (t, w) in sorted(role_profiles().items()):
+            print(f"{role:32s} " + " ".join(f"{DIMENSIONES[d]['code']}={v:.0f}" for d, v in zip(DIM_LIST, t)))
+        return
+    if args.k < 1: ap.error("-k debe ser al menos 1")
+    bands, codes, names = {}, [DIMENSIONES[d]["code"] for d in DIM_LIST], [lvl for lvl, _ in LEVELS]
+    for spec in args.band:
+        dim, _, levels = spec.partition("=")
+        dim, levels = dim.strip(), [x.strip() for x in levels.split(",")]
+        if dim not in codes and dim not in DIM_LIST:
+            ap.error(f"--band {spec!r}: dimensión desconocida (usa {', '.join(codes)} o el nombre completo)")
+        bad = [x for x in levels if x not in names]
+        if bad: ap.error(f"--band {spec!r}: nivel desconocido {', '.join(bad)} (niveles: {', '.join(names)})")
+        bands[dim] = levels
+
+    if args.bench:
+        rng = np.random.default_rng(0)
+        index = RoleFitIndex(capacity=args.bench)
+        t0 = time.perf_counter()
+        index.add(np.arange(args.bench), np.round(rng.normal(50, 15, (args.bench, len(DIM_LIST))).clip(0, 100), 1))
+        print(f"índice de {args.bench:,} candidatos en {(time.perf_counter()-t0)*1000:.0f} ms")
+        roles = sorted(index.profiles)
+        for label, flt in (("sin filtro", None), ("con filtro", bands or {"C": ["Alto", "Muy Alto"]})):
+            t0 = time.perf_counter()
+            for role in roles: index.top_k(role, args.k, flt)
+            print(f"top-{args.k} {label}: {(time.perf_counter()-t0)*1000/len(roles):.2f} ms/consulta")
+        return
+
+    if not args.role: ap.error("indica un rol (usa --list-roles para verlos)")
+    if args.role not in role_profiles(): ap.error(f"rol desconocido: {args.role!r} (usa --list-roles para verlos)")
+    index = RoleFitIndex.from_results(os.path.join(args.data_dir, "resultados.jsonl"))
+    for rank, (cid, fit, res) in enumerate(index.top_k(args.role, args.k, bands), 1):
+        print(f"{rank:3d}. {cid}  ajuste={fit:5.1f}  " +
+              " ".join(f"{DIMENSIONES[d]['code']}={v:.1f}" for d, v in res.items()))
+
+if __name__ == "__main__":
+    main()
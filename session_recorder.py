@@ -0,0 +1,57 @@
+# ================================================================
+#  Big Five — Grabación opcional de sesiones (para reproducir reruns)
+#  Con BIGFIVE_RECORD_DIR definido, cada sesión escribe sus eventos
+#  (inicio, cambios de etapa, respuestas, exportaciones) en un JSON
+#  Lines compacto; replay.py los vuelve a ejecutar sin navegador.
+# ================================================================
+import json
+import os
+import threading
+import time
+
+FORMAT = 1
+
+def record_dir()->str:
+    """BIGFIVE_RECORD_DIR leído en cada llamada (vacío = no se graba): replay.py lo vacía en caliente."""
+    return os.environ.get("BIGFIVE_RECORD_DIR", "")
+
+class SessionRecorder:
+    """Una línea JSON por evento: {"t": segundos desde el inicio, "ev": tipo, ...datos}.
+
+    Se escribe en modo append y se cierra en cada evento: si el proceso muere, lo
+    grabado hasta ese momento sigue siendo reproducible. Es seguro entre hilos (la
+    descarga diferida de informes se sirve fuera del hilo del script).
+    """
+    def __init__(self, path:str):
+        self.path = path
+        self.t0 = time.monotonic()
+        self.lock = threading.Lock()
+
+    def log(self, ev:str, **data):
+        line = json.dumps({"t": round(time.monotonic() - self.t0, 3), "ev": ev, **data},
+                          ensure_ascii=False, separators=(",", ":"))
+        with self.lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+def open_recorder(root:str, session_id:str, **start)->SessionRecorder:
+    """Crea el archivo de la sesión y graba el evento de inicio con `start` (query params, modos...)."""
+    os.makedirs(root, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{(session_id or 'local')[:8]}.jsonl"
+    rec = SessionRecorder(os.path.join(root, name))
+    rec.log("inicio", v=FORMAT, **start)
+    return rec
+
+def load_events(path:str)->list:
+    """Eventos de una grabación; ignora una última línea truncada (proceso interrumpido)."""
+    events = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    if not events or events[0].get("ev") != "inicio":
+        raise ValueError(f"{path}: no es una grabación de sesión")
+    if events[0].get("v") != FORMAT:
+        raise ValueError(f"{path}: formato {events[0].get('v')} no soportado (se espera {FORMAT})")
+    return events
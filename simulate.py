@@ -0,0 +1,219 @@
+# ================================================================
+#  Big Five — Simulador Monte Carlo para calibrar las bandas
+#  Genera respondentes sintéticos (modelo de rasgo latente o remuestreo
+#  de datos guardados), los puntúa con la ruta vectorizada y resume
+#  frecuencias por banda, sensibilidad a los cortes y efecto del redondeo.
+#  Uso: python simulate.py -n 2000000
+#       python simulate.py -n 5000000 --procs 4 --loading 0.6 --corr 0.2
+#       python simulate.py --from data/archivo -n 1000000
+# ================================================================
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bigfive import BUILTIN, Instrument
+from cohort import iter_results
+
+SCORE_RES = 10                  # histograma con resolución de 0.1 puntos (la de compute_scores)
+N_BINS = 100 * SCORE_RES + 1
+CHUNK = 200_000                 # respondentes por bloque (acota la memoria: ~80 MB en float64)
+
+# Modelo latente: θ ~ N(mean, sd) por dimensión con correlación uniforme `corr`;
+# respuesta continua y = loading·θ (con signo invertido en ítems inversos)
+# + acquiescence + ruido, discretizada en la escala con los puntos de corte `cuts`.
+DEFAULT_MODEL = {
+    "mean": 0.0,
+    "sd": 1.0,
+    "corr": 0.0,
+    "loading": 0.7,
+    "cuts": (-1.5, -0.5, 0.5, 1.5),   # 4 cortes -> escala de 5 puntos
+    "acquiescence": 0.0,              # sesgo a responder "de acuerdo" (en unidades de y)
+    "missing": 0.0,                   # probabilidad de dejar un ítem sin responder
+}
+
+# ---------------------------------------------------------------
+# Generación de respuestas
+# ---------------------------------------------------------------
+def latent_answers(rng:np.random.Generator, n:int, model:dict, inst:Instrument=BUILTIN)->np.ndarray:
+    """(n × ítems) int8 con 0 = sin respuesta."""
+    m = {**DEFAULT_MODEL, **model}
+    nd = len(inst.dim_list)
+    cuts = np.asarray(m["cuts"], dtype=np.float32)
+    if len(cuts) != inst.hi - inst.lo: raise ValueError(f"cuts debe tener {inst.hi - inst.lo} valores")
+    C = np.full((nd, nd), m["corr"]); np.fill_diagonal(C, 1.0)
+    L = np.linalg.cholesky(C).astype(np.float32)
+    theta = (rng.standard_normal((n, nd), dtype=np.float32) @ L.T) * np.float32(m["sd"]) + np.float32(m["mean"])
+    dim_idx = inst.dim_onehot.argmax(axis=1)
+    sign = np.where(inst.rev_mask, -1.0, 1.0).astype(np.float32)
+    lam = np.float32(m["loading"])
+    y = theta[:, dim_idx] * (lam * sign)
+    y += rng.standard_normal(y.shape, dtype=np.float32) * np.float32(np.sqrt(max(1.0 - lam * lam, 0.0)))
+    y += np.float32(m["acquiescence"])
+    A = np.full(y.shape, inst.lo, dtype=np.int8)
+    for c in cuts: A += y > c  # más rápido que searchsorted con tan pocos cortes
+    if m["missing"] > 0: A[rng.random(A.shape, dtype=np.float32) < m["missing"]] = 0
+    return A
+
+def load_pool(source:str, inst:Instrument=BUILTIN)->np.ndarray:
+    """Respuestas guardadas para remuestrear: directorio de archive.py (memmap) o JSONL de resultados."""
+    if os.path.isdir(source):
+        from archive import ResponseArchive
+        arc = ResponseArchive(source)
+        arc.check_instrument(inst)
+        return arc.answers
+    answer_sets = [row["answers"] for row, _ in iter_results(source, instrumento=inst.key)]
+    return inst.answers_matrix(answer_sets)
+
+# ---------------------------------------------------------------
+# Simulación (por fragmentos combinables)
+# ---------------------------------------------------------------
+def simulate_shard(n:int, seed, model:dict|None=None, source:str|None=None, inst:Instrument=BUILTIN)->dict:
+    """Simula n respondentes y devuelve solo conteos (sumables entre fragmentos)."""
+    rng = np.random.default_rng(seed)
+    pool = load_pool(source, inst) if source else None
+    if pool is not None and len(pool) == 0: raise ValueError(f"{source}: no hay respuestas para remuestrear")
+    nd, nl = len(inst.dim_list), len(inst.levels)
+    out = {"n": 0, "hist": np.zeros((nd, N_BINS), dtype=np.int64),
+           "band_raw": np.zeros((nd, nl), dtype=np.int64), "zone_raw": np.zeros((nd, 3), dtype=np.int64),
+           "band_flips": np.zeros(nd, dtype=np.int64), "zone_flips": np.zeros(nd, dtype=np.int64)}
+    offsets = (np.arange(nd) * N_BINS)[:, None]
+    for a in range(0, n, CHUNK):
+        k = min(CHUNK, n - a)
+        A = pool[np.sort(rng.integers(0, len(pool), k))] if pool is not None else latent_answers(rng, k, model or {}, inst)
+        raw = inst.compute_scores_batch(A, decimals=None)
+        rounded = np.round(raw, 1)
+        idx = np.rint(rounded * SCORE_RES).astype(np.int64).T
+        out["hist"] += np.bincount((idx + offsets).ravel(), minlength=nd * N_BINS).reshape(nd, N_BINS)
+        b_raw, b_rnd = inst.level_codes(raw), inst.level_codes(rounded)
+        z_raw, z_rnd = (np.searchsorted(inst.profile_cuts, x, side="right") for x in (raw, rounded))
+        out["band_raw"] += np.stack([np.bincount(b_raw[:, j], minlength=nl) for j in range(nd)])
+        out["zone_raw"] += np.stack([np.bincount(z_raw[:, j], minlength=3) for j in range(nd)])
+        out["band_flips"] += (b_raw != b_rnd).sum(axis=0)
+        out["zone_flips"] += (z_raw != z_rnd).sum(axis=0)
+        out["n"] += k
+    return out
+
+def simulate(n:int, model:dict|None=None, source:str|None=None, procs:int=1, seed:int=0,
+             inst:Instrument=BUILTIN)->dict:
+    """Reparte n respondentes en `procs` procesos con semillas independientes y suma los conteos."""
+    seeds = np.random.SeedSequence(seed).spawn(procs)
+    sizes = [n // procs + (i < n % procs) for i in range(procs)]
+    if procs == 1:
+        parts = [simulate_shard(n, seeds[0], model, source, inst)]
+    else:
+        with ProcessPoolExecutor(procs) as ex:
+            parts = list(ex.map(simulate_shard, sizes, seeds, [model] * procs, [source] * procs, [inst] * procs))
+    total = parts[0]
+    for p in parts[1:]:
+        for k in total: total[k] = total[k] + p[k]
+    return total
+
+# ---------------------------------------------------------------
+# Resumen
+# ---------------------------------------------------------------
+def summarize(sim:dict, inst:Instrument=BUILTIN, delta:float=2.5)->dict:
+    """Frecuencias por banda y zona, masa en torno a cada corte y efecto del redondeo (en %)."""
+    n, hist = sim["n"], sim["hist"]
+    cum = np.concatenate([np.zeros((len(hist), 1), dtype=np.int64), np.cumsum(hist, axis=1)], axis=1)
+    def share_below(c):  # % con puntuación redondeada < c
+        return 100.0 * cum[:, int(np.clip(np.ceil(c * SCORE_RES - 1e-9), 0, N_BINS))] / n
+    def freqs(cuts):
+        edges = [np.zeros(len(hist))] + [share_below(c) for c in cuts] + [np.full(len(hist), 100.0)]
+        return np.diff(np.stack(edges, axis=1), axis=1)
+    codes = [inst.dims[d]["code"] for d in inst.dim_list]
+    values = np.arange(N_BINS) / SCORE_RES
+    attained = [values[h > 0] for h in hist]
+    report = {
+        "n": n,
+        "dims": codes,
+        "levels": [lvl for lvl, _ in inst.levels],
+        "bands": freqs(inst.level_cuts),
+        "zones": freqs(inst.profile_cuts),
+        "mean": (hist @ values) / n,
+        "distinct_scores": [len(v) for v in attained],
+        "step": [float(np.diff(v).min()) if len(v) > 1 else 0.0 for v in attained],
+        "cuts": {},
+        "rounding": {"band_flips": 100.0 * sim["band_flips"] / n, "zone_flips": 100.0 * sim["zone_flips"] / n,
+                     "bands_raw": 100.0 * sim["band_raw"] / n, "zones_raw": 100.0 * sim["zone_raw"] / n},
+    }
+    for c in sorted(set(inst.level_cuts) | set(inst.profile_cuts)):
+        at = 100.0 * hist[:, int(round(c * SCORE_RES))] / n if 0 <= c <= 100 else np.zeros(len(hist))
+        near = share_below(c + delta) - share_below(c - delta)
+        report["cuts"][c] = {"at": at, "near": near,
+                             "below": np.stack([share_below(c - delta), share_below(c), share_below(c + delta)])}
+    return report
+
+def _row(label:str, vals, fmt:str="{:6.1f}")->str:
+    return f"{label:24s}" + " ".join(fmt.format(v) for v in vals)
+
+def print_report(rep:dict, delta:float):
+    print(_row("", rep["dims"], "{:>6s}"))
+    print(_row("media", rep["mean"]))
+    print(_row("valores distintos", rep["distinct_scores"], "{:6d}"))
+    print(_row("paso entre valores", rep["step"], "{:6.2f}"))
+    print("\n% por banda (level_label)")
+    for j, lvl in enumerate(rep["levels"]):
+        print(_row(f"  {lvl}", rep["bands"][:, j]))
+    print("\n% por zona (dimension_profile)")
+    for j, name in enumerate(("bajo", "medio", "alto")):
+        print(_row(f"  {name}", rep["zones"][:, j]))
+    print(f"\nSensibilidad a los cortes (±{delta:g} puntos)")
+    for c, s in rep["cuts"].items():
+        for label, vals in zip((f"< {c - delta:g}", f"< {c:g}", f"< {c + delta:g}"), s["below"]):
+            print(_row(f"  {label}", vals))
+        print(_row(f"  = {c:g} (sube de banda)", s["at"]))
+        print(_row(f"  a ±{delta:g} de {c:g}", s["near"]))
+    print("\nRedondeo a 1 decimal (% de respondentes que cambian)")
+    print(_row("  banda", rep["rounding"]["band_flips"], "{:6.3f}"))
+    print(_row("  zona", rep["rounding"]["zone_flips"], "{:6.3f}"))
+
+def _jsonable(x):
+    if isinstance(x, np.ndarray): return x.round(4).tolist()
+    if isinstance(x, dict): return {str(k): _jsonable(v) for k, v in x.items()}
+    if isinstance(x, list): return [_jsonable(v) for v in x]
+    return x
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulación Monte Carlo de puntuaciones y bandas.")
+    ap.add_argument("-n", type=int, default=1_000_000, help="Respondentes sintéticos")
+    ap.add_argument("--procs", type=int, default=1, help="Procesos (fragmentos con semillas independientes)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--from", dest="source", help="Remuestrea respuestas guardadas (archivo columnar o JSONL)")
+    ap.add_argument("--pack", help="Pack de instrumento (por defecto, el integrado)")
+    ap.add_argument("--delta", type=float, default=2.5, help="Desplazamiento de los cortes para la sensibilidad")
+    for k, v in DEFAULT_MODEL.items():
+        if k == "cuts":
+            ap.add_argument("--cuts", default=",".join(map(str, v)), help="Cortes de y en la escala Likert")
+        else:
+            ap.add_argument(f"--{k}", type=float, default=v)
+    ap.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = ap.parse_args(argv)
+
+    inst = BUILTIN
+    if args.pack:
+        from instrument_packs import compile_pack
+        with open(args.pack, "rb") as fh:
+            inst = compile_pack(fh.read(), args.pack)
+    model = {k: getattr(args, k) for k in DEFAULT_MODEL}
+    model["cuts"] = tuple(float(x) for x in args.cuts.split(","))
+
+    t0 = time.perf_counter()
+    sim = simulate(args.n, None if args.source else model, args.source, args.procs, args.seed, inst)
+    elapsed = time.perf_counter() - t0
+    rep = summarize(sim, inst, args.delta)
+    if args.json:
+        print(json.dumps(_jsonable({**rep, "seconds": elapsed,
+                                    "model": None if args.source else model, "source": args.source})))
+        return
+    src = f"remuestreo de {args.source}" if args.source else \
+        "modelo latente " + " ".join(f"{k}={v}" for k, v in model.items())
+    print(f"{rep['n']:,} respondentes · {inst.key} · {src}")
+    print(f"{elapsed:.2f} s ({rep['n']/elapsed:,.0f} respondentes/s, {args.procs} proceso(s))\n")
+    print_report(rep, args.delta)
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,25 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import os
+import hmac
+import time
 from datetime import datetime
-from io import BytesIO
-
-# Intento usar matplotlib (para PDF). Si no está, fallback a HTML.
-HAS_MPL = False
 try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_pdf import PdfPages
-    from matplotlib.patches import FancyBboxPatch, Wedge, Circle
-    HAS_MPL = True
-except Exception:
-    HAS_MPL = False
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # API interna de Streamlit: sin ella no hay medición ni id de sesión
+    def get_script_run_ctx(): return None
+
+from bigfive import HAS_MPL, BUILTIN, DIMENSIONES, DIM_LIST, QUESTIONS, LEVELS, build_pdf, build_html
+from instrument_packs import InstrumentRegistry
+from cohort import CohortStore, ALL, HIST_EDGES
+from role_fit import RoleFitIndex
+from telemetry import LatencyRing
+from payload_store import PayloadStore
+from warmup import Warmup, default_tasks
+from payload_meter import RerunMeter, StageStats, install as install_meter, disabled as meter_disabled
+from comparison import MAX_CANDIDATES, build_comparison_pdf, build_comparison_html
+from session_recorder import open_recorder, record_dir
 
 # ---------------------------------------------------------------
 # Config general
@@ -30,6 +37,43 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# ---------------------------------------------------------------
+# Vista de gestión (?vista=cohorte): solo si hay clave configurada
+# (BIGFIVE_ADMIN_TOKEN o admin_token en st.secrets) y tras ingresarla;
+# sin clave configurada el parámetro se ignora y se ve el test.
+# ---------------------------------------------------------------
+def admin_token()->str:
+    token = os.environ.get("BIGFIVE_ADMIN_TOKEN", "")
+    if not token:
+        try:
+            token = str(st.secrets.get("admin_token", ""))
+        except Exception:
+            token = ""  # sin secrets.toml
+    return token
+
+ADMIN_VIEW = st.query_params.get("vista") == "cohorte" and bool(admin_token())
+
+def on_admin_login():
+    given = st.session_state.get("_clave_admin", "")
+    st.session_state._admin = hmac.compare_digest(given.encode("utf-8"), admin_token().encode("utf-8"))
+    st.session_state._admin_fallo = not st.session_state._admin
+
+# ---------------------------------------------------------------
+# Bytes por rerun (payload_meter.py) y modo de render
+# consolidado: cada tarjeta de dimensión es un único elemento HTML
+# clasico: una llamada st.markdown por viñeta + medidor Plotly
+# ---------------------------------------------------------------
+RENDER_MODE = st.query_params.get("render", os.environ.get("BIGFIVE_RENDER", "consolidado"))
+
+@st.cache_resource
+def get_stage_stats():
+    return StageStats()
+
+if "_medidor" not in st.session_state: st.session_state._medidor = RerunMeter(get_stage_stats())
+_stage = "cohorte" if ADMIN_VIEW else st.session_state.get("stage", "inicio")
+st.session_state._medidor.begin(f"{_stage} · {RENDER_MODE}")
+install_meter(get_script_run_ctx(), st.session_state._medidor)
+
 # ---------------------------------------------------------------
 # Estilos: fondo blanco, tipografías y UI suave + tarjetas color pastel
 # ---------------------------------------------------------------
@@ -131,6 +175,7 @@ hr{ border:none; border-top:1px solid #eee; margin:16px 0; }
 .dim-section h4{ margin:.2rem 0 .4rem 0; font-size:1rem; }
 .dim-list{ margin:.2rem 0; padding-left:18px; }
 .dim-list li{ margin:.15rem 0; }
+.dim-gauge{ display:block; width:100%; max-width:340px; margin:0 auto 12px auto; }
 
 /* Badges nivel */
 .badge{
@@ -143,314 +188,138 @@ hr{ border:none; border-top:1px solid #eee; margin:16px 0; }
 </style>
 """, unsafe_allow_html=True)
 
-# ---------------------------------------------------------------
-# Definiciones Big Five
-# ---------------------------------------------------------------
-def reverse_score(v:int)->int: return 6 - v
-
-# Paleta por dimensión
-DIMENSIONES = {
-    "Apertura a la Experiencia": {
-        "code":"O", "icon":"",
-        "desc":"Curiosidad intelectual, creatividad y apertura al cambio.",
-        "color":"#8FB996",
-        "fort_high":[
-            "Genera ideas originales y puentes entre conceptos.",
-            "Explora nuevas metodologías con aprendizaje rápido.",
-            "Promueve mejora continua y experimentación controlada.",
-        ],
-        "risk_high":[
-            "Puede dispersarse en demasiadas líneas de trabajo.",
-            "Riesgo de sobre-innovar sin consolidar procesos.",
-            "Tendencia a aburrirse con tareas repetitivas.",
-        ],
-        "fort_low":[
-            "Constancia y apego a estándares probados.",
-            "Ejecución confiable en entornos estables.",
-        ],
-        "risk_low":[
-            "Resistencia al cambio y menor exploración conceptual.",
-            "Más dificultad para innovar en ambigüedad.",
-        ],
-        "recs_low":[
-            "Implementar micro-experimentos quincenales de 1h.",
-            "Exposición breve a nuevas herramientas (demo/POC).",
-        ],
-        "roles_high":["Innovación","I+D","Diseño","Estrategia","Consultoría"],
-        "roles_low":["Operaciones estandarizadas","Control de calidad"],
-        "no_apt_high":["Cargos ultra-rutinarios sin espacio creativo"],
-        "no_apt_low":["Laboratorios de innovación, estrategia corporativa"]
-    },
-    "Responsabilidad": {
-        "code":"C", "icon":"",
-        "desc":"Orden, planificación, disciplina y cumplimiento de objetivos.",
-        "color":"#A1C3D1",
-        "fort_high":[
-            "Fiabilidad en plazos y calidad del entregable.",
-            "Excelente gestión del tiempo y priorización.",
-            "Documentación y control de procesos destacables.",
-        ],
-        "risk_high":[
-            "Perfeccionismo que retrasa entregas.",
-            "Rigidez ante cambios de última hora.",
-        ],
-        "fort_low":[
-            "Flexibilidad y adaptación rápida a imprevistos.",
-            "Espacio para creatividad sin autoexigencia excesiva.",
-        ],
-        "risk_low":[
-            "Procrastinación y baja tasa de finalización.",
-            "Desorden operativo si no hay supervisión.",
-        ],
-        "recs_low":[
-            "Timeboxing diario y checklist de 3 prioridades.",
-            "Revisión semanal con métricas de finalización.",
-        ],
-        "roles_high":["Gestión de Proyectos","Finanzas","Auditoría","Operaciones"],
-        "roles_low":["Ideación temprana abierta"],
-        "no_apt_high":["Entornos caóticos sin procesos definidos"],
-        "no_apt_low":["PMO, compliance, control interno"]
-    },
-    "Extraversión": {
-        "code":"E", "icon":"",
-        "desc":"Asertividad, sociabilidad y energía en interacción.",
-        "color":"#F2C6B4",
-        "fort_high":[
-            "Networking sostenido y visibilidad del equipo.",
-            "Comunicación clara ante grupos y stakeholders.",
-            "Motivación del equipo en contextos colaborativos.",
-        ],
-        "risk_high":[
-            "Riesgo de monopolizar conversaciones.",
-            "Puede subvalorar la escucha profunda/activa.",
-        ],
-        "fort_low":[
-            "Profundidad de análisis y foco individual.",
-            "Comunicación escrita sólida y estructurada.",
-        ],
-        "risk_low":[
-            "Evita exposición y grandes audiencias.",
-            "Menor presencia en foros de decisión.",
-        ],
-        "recs_low":[
-            "Exposición gradual a presentaciones (micro-stands).",
-            "Reuniones 1:1 para construir confianza.",
-        ],
-        "roles_high":["Ventas","Relaciones Públicas","Liderazgo Comercial","BD"],
-        "roles_low":["Análisis","Investigación","Programación","Datos"],
-        "no_apt_high":["Roles de aislamiento con mínima interacción"],
-        "no_apt_low":["Puestos comerciales de alto contacto inmediato"]
-    },
-    "Amabilidad": {
-        "code":"A", "icon":"",
-        "desc":"Colaboración, empatía y confianza.",
-        "color":"#E8D6CB",
-        "fort_high":[
-            "Clima de confianza y cohesión en el equipo.",
-            "Gestión empática de conflictos.",
-            "Excelente experiencia de cliente/usuario.",
-        ],
-        "risk_high":[
-            "Evitar conversaciones difíciles o decir 'no'.",
-            "Difícil establecer límites en alta presión.",
-        ],
-        "fort_low":[
-            "Objetividad y firmeza en decisiones.",
-            "Negociación más dura con foco en métricas.",
-        ],
-        "risk_low":[
-            "Relaciones sensibles pueden deteriorarse.",
-            "Riesgo de fricción intraequipo si no hay tacto.",
-        ],
-        "recs_low":[
-            "Entrenar feedback con método SBI.",
-            "Establecer límites claros por escrito.",
-        ],
-        "roles_high":["RR.HH.","Customer Success","Mediación","Atención a clientes"],
-        "roles_low":["Negociación dura","Trading"],
-        "no_apt_high":["Roles donde se requiere confrontación permanente"],
-        "no_apt_low":["Facilitación, mediación, soporte sensible"]
-    },
-    "Estabilidad Emocional": {
-        "code":"N", "icon":"",
-        "desc":"Gestión del estrés, resiliencia y calma bajo presión.",
-        "color":"#D6EADF",
-        "fort_high":[
-            "Serenidad en incidentes y crisis.",
-            "Recuperación rápida y foco en soluciones.",
-            "Juicio estable en incertidumbre.",
-        ],
-        "risk_high":[
-            "Subestimar señales de estrés ajeno.",
-            "Puede comunicar calma como frialdad.",
-        ],
-        "fort_low":[
-            "Sensibilidad que potencia empatía y creatividad.",
-        ],
-        "risk_low":[
-            "Rumiación, estrés elevado y fluctuaciones de ánimo.",
-            "Toma de decisiones afectada por presión.",
-        ],
-        "recs_low":[
-            "Técnicas 4-7-8 y pausas de respiración.",
-            "Rutina de sueño + journaling breve diario.",
-        ],
-        "roles_high":["Operaciones críticas","Dirección","Soporte incidentes","Compliance"],
-        "roles_low":["Ambientes caóticos sin soporte"],
-        "no_apt_high":["Roles donde se requiera hiper-empatía constante"],
-        "no_apt_low":["Puestos de alta presión sin acompañamiento"]
-    },
-}
-DIM_LIST = list(DIMENSIONES.keys())
-LIKERT = {1:"Totalmente en desacuerdo", 2:"En desacuerdo", 3:"Neutral", 4:"De acuerdo", 5:"Totalmente de acuerdo"}
-LIK_KEYS = list(LIKERT.keys())
-
-# 50 ítems (10 por dimensión; 5 directos, 5 invertidos)
-QUESTIONS = [
-    # O
-    {"text":"Tengo una imaginación muy activa.","dim":"Apertura a la Experiencia","key":"O1","rev":False},
-    {"text":"Me atraen ideas nuevas y complejas.","dim":"Apertura a la Experiencia","key":"O2","rev":False},
-    {"text":"Disfruto del arte y la cultura.","dim":"Apertura a la Experiencia","key":"O3","rev":False},
-    {"text":"Busco experiencias poco convencionales.","dim":"Apertura a la Experiencia","key":"O4","rev":False},
-    {"text":"Valoro la creatividad sobre la rutina.","dim":"Apertura a la Experiencia","key":"O5","rev":False},
-    {"text":"Prefiero mantener hábitos que probar cosas nuevas.","dim":"Apertura a la Experiencia","key":"O6","rev":True},
-    {"text":"Las discusiones filosóficas me parecen poco útiles.","dim":"Apertura a la Experiencia","key":"O7","rev":True},
-    {"text":"Rara vez reflexiono sobre conceptos abstractos.","dim":"Apertura a la Experiencia","key":"O8","rev":True},
-    {"text":"Me inclino por lo tradicional más que por lo original.","dim":"Apertura a la Experiencia","key":"O9","rev":True},
-    {"text":"Evito cambiar mis hábitos establecidos.","dim":"Apertura a la Experiencia","key":"O10","rev":True},
-    # C
-    {"text":"Estoy bien preparado/a para mis tareas.","dim":"Responsabilidad","key":"C1","rev":False},
-    {"text":"Cuido los detalles al trabajar.","dim":"Responsabilidad","key":"C2","rev":False},
-    {"text":"Cumplo mis compromisos y plazos.","dim":"Responsabilidad","key":"C3","rev":False},
-    {"text":"Sigo un plan y un horario definidos.","dim":"Responsabilidad","key":"C4","rev":False},
-    {"text":"Me exijo altos estándares de calidad.","dim":"Responsabilidad","key":"C5","rev":False},
-    {"text":"Dejo mis cosas desordenadas.","dim":"Responsabilidad","key":"C6","rev":True},
-    {"text":"Evito responsabilidades cuando puedo.","dim":"Responsabilidad","key":"C7","rev":True},
-    {"text":"Me distraigo con facilidad.","dim":"Responsabilidad","key":"C8","rev":True},
-    {"text":"Olvido colocar las cosas en su lugar.","dim":"Responsabilidad","key":"C9","rev":True},
-    {"text":"Aplazo tareas importantes.","dim":"Responsabilidad","key":"C10","rev":True},
-    # E
-    {"text":"Disfruto ser visible en reuniones.","dim":"Extraversión","key":"E1","rev":False},
-    {"text":"Me siento a gusto con personas nuevas.","dim":"Extraversión","key":"E2","rev":False},
-    {"text":"Busco la compañía de otras personas.","dim":"Extraversión","key":"E3","rev":False},
-    {"text":"Participo activamente en conversaciones.","dim":"Extraversión","key":"E4","rev":False},
-    {"text":"Me energiza compartir con otros.","dim":"Extraversión","key":"E5","rev":False},
-    {"text":"Prefiero estar solo/a que rodeado/a de gente.","dim":"Extraversión","key":"E6","rev":True},
-    {"text":"Soy más bien reservado/a y callado/a.","dim":"Extraversión","key":"E7","rev":True},
-    {"text":"Me cuesta expresarme ante grupos grandes.","dim":"Extraversión","key":"E8","rev":True},
-    {"text":"Prefiero actuar en segundo plano.","dim":"Extraversión","key":"E9","rev":True},
-    {"text":"Me agotan las interacciones sociales prolongadas.","dim":"Extraversión","key":"E10","rev":True},
-    # A
-    {"text":"Empatizo con las emociones de los demás.","dim":"Amabilidad","key":"A1","rev":False},
-    {"text":"Me preocupo por el bienestar ajeno.","dim":"Amabilidad","key":"A2","rev":False},
-    {"text":"Trato a otros con respeto y consideración.","dim":"Amabilidad","key":"A3","rev":False},
-    {"text":"Ayudo sin esperar nada a cambio.","dim":"Amabilidad","key":"A4","rev":False},
-    {"text":"Confío en las buenas intenciones de la gente.","dim":"Amabilidad","key":"A5","rev":False},
-    {"text":"No me interesa demasiado la gente.","dim":"Amabilidad","key":"A6","rev":True},
-    {"text":"Sospecho de las intenciones ajenas.","dim":"Amabilidad","key":"A7","rev":True},
-    {"text":"A veces soy poco considerado/a.","dim":"Amabilidad","key":"A8","rev":True},
-    {"text":"Pienso primero en mí antes que en otros.","dim":"Amabilidad","key":"A9","rev":True},
-    {"text":"Los problemas de otros no me afectan mucho.","dim":"Amabilidad","key":"A10","rev":True},
-    # N
-    {"text":"Me mantengo calmado/a bajo presión.","dim":"Estabilidad Emocional","key":"N1","rev":False},
-    {"text":"Rara vez me siento ansioso/a o estresado/a.","dim":"Estabilidad Emocional","key":"N2","rev":False},
-    {"text":"Soy emocionalmente estable.","dim":"Estabilidad Emocional","key":"N3","rev":False},
-    {"text":"Me recupero rápido de contratiempos.","dim":"Estabilidad Emocional","key":"N4","rev":False},
-    {"text":"Me siento seguro/a de mí mismo/a.","dim":"Estabilidad Emocional","key":"N5","rev":False},
-    {"text":"Me preocupo demasiado por las cosas.","dim":"Estabilidad Emocional","key":"N6","rev":True},
-    {"text":"Me irrito con facilidad.","dim":"Estabilidad Emocional","key":"N7","rev":True},
-    {"text":"Con frecuencia me siento triste.","dim":"Estabilidad Emocional","key":"N8","rev":True},
-    {"text":"Tengo cambios de ánimo frecuentes.","dim":"Estabilidad Emocional","key":"N9","rev":True},
-    {"text":"El estrés me sobrepasa.","dim":"Estabilidad Emocional","key":"N10","rev":True},
-]
-KEY2IDX = {q["key"]:i for i,q in enumerate(QUESTIONS)}
-
 # ---------------------------------------------------------------
 # Estado
 # ---------------------------------------------------------------
 if "stage" not in st.session_state: st.session_state.stage = "inicio"  # inicio | test | resultados
+if "instrumento" not in st.session_state: st.session_state.instrumento = BUILTIN.key
 if "q_idx" not in st.session_state: st.session_state.q_idx = 0
 if "answers" not in st.session_state: st.session_state.answers = {q["key"]:None for q in QUESTIONS}
 if "fecha" not in st.session_state: st.session_state.fecha = None
 if "_needs_rerun" not in st.session_state: st.session_state._needs_rerun = False
+if "area" not in st.session_state: st.session_state.area = ""
+if "latencias" not in st.session_state: st.session_state.latencias = LatencyRing()
+if "_t_item" not in st.session_state: st.session_state._t_item = (-1, 0.0)  # (ítem mostrado, instante)
+
+# ---------------------------------------------------------------
+# Persistencia de resultados + agregados de cohorte (uno por proceso)
+# ---------------------------------------------------------------
+DATA_DIR = os.environ.get("BIGFIVE_DATA_DIR", "data")
+
+# ---------------------------------------------------------------
+# Instrumentos: packs versionados de ./packs (caché compilada), uno por sesión
+# ---------------------------------------------------------------
+PACKS_DIR = os.environ.get("BIGFIVE_PACKS_DIR", "packs")
+
+@st.cache_resource
+def get_registry():
+    return InstrumentRegistry(PACKS_DIR)
+
+def current_instrument():
+    return get_registry().get(st.session_state.instrumento)
+
+@st.cache_resource
+def get_cohort_store():
+    return CohortStore(DATA_DIR)
 
 # ---------------------------------------------------------------
-# Utilidades de cálculo
+# Informes descargables: en disco, deduplicados, con tope y TTL
 # ---------------------------------------------------------------
-def compute_scores(answers:dict)->dict:
-    buckets = {d:[] for d in DIM_LIST}
-    for q in QUESTIONS:
-        raw = answers.get(q["key"])
-        v = 3 if raw is None else (reverse_score(raw) if q["rev"] else raw)
-        buckets[q["dim"]].append(v)
-    out = {}
-    for d, vals in buckets.items():
-        avg = np.mean(vals)
-        perc = ((avg - 1) / 4.0) * 100
-        out[d] = round(float(perc), 1)
-    return out
-
-def level_label(score:float):
-    if score>=75: return "Muy Alto","Dominante"
-    if score>=60: return "Alto","Marcado"
-    if score>=40: return "Promedio","Moderado"
-    if score>=25: return "Bajo","Suave"
-    return "Muy Bajo","Mínimo"
-
-def dimension_profile(d:str, score:float):
-    ds = DIMENSIONES[d]
-    if score>=60:
-        f = ds["fort_high"] + [
-            "Capacidad de modelar buenas prácticas para pares.",
-            "Eleva el estándar del equipo en esa dimensión."
-        ]
-        r = ds["risk_high"] + ["Si no se regula, impacta foco/tiempos de otros."]
-        rec = [
-            "Definir OKRs y criterios de cierre por sprint.",
-            "Hitos intermedios con aceptación por pares.",
-            "Revisión quincenal para calibrar foco/impacto."
-        ]
-        roles = ds["roles_high"]; not_apt = ds.get("no_apt_high", [])
-        expl = "KPI alto: tu conducta típica favorece el desempeño cuando el rol exige este rasgo como palanca principal."
-    elif score<40:
-        f = ds["fort_low"] + ["Estabilidad de ejecución en límites conocidos."]
-        r = ds["risk_low"] + ["Puede requerir soporte explícito en entornos de presión/ambigüedad."]
-        rec = ds["recs_low"] + [
-            "Rutina breve semanal de reflexión de aprendizajes.",
-            "Definir 1 hábito palanca (2 min/día) durante 21 días."
-        ]
-        roles = ds["roles_low"]; not_apt = ds.get("no_apt_low", [])
-        expl = "KPI bajo: tu estilo se sitúa en el extremo opuesto; útil en ciertos contextos, con riesgos en otros si no hay compensaciones."
+PAYLOAD_DIR = os.environ.get("BIGFIVE_PAYLOAD_DIR", os.path.join(".cache", "informes"))
+REPORT_BUILDERS = {"pdf": build_pdf, "html": build_html}
+
+@st.cache_resource
+def get_payload_store():
+    return PayloadStore(PAYLOAD_DIR,
+                        max_bytes=int(float(os.environ.get("BIGFIVE_PAYLOAD_MAX_MB", "256")) * 2**20),
+                        ttl=float(os.environ.get("BIGFIVE_PAYLOAD_TTL", "3600")))
+
+def session_id()->str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else ""
+
+def report_download(res:dict, inst, fmt:str):
+    """Callable para st.download_button: el informe se genera una vez por resultado y
+    se lee de disco solo al pulsar (si el TTL lo expulsó, se regenera)."""
+    store, fecha = get_payload_store(), st.session_state.fecha
+    fp = (inst.key, fecha, fmt, tuple(res.values()))
+    cached = st.session_state.get("_informe")
+    if cached and cached[0] == fp and store.contains(cached[1]):
+        h = cached[1]
     else:
-        f = ["Balance situacional entre ambos extremos", "Capacidad de lectura del contexto antes de actuar"]
-        r = ["Variabilidad entre equipos/líderes; alinear expectativas", "Riesgo de ambivalencia si faltan métricas claras"]
-        rec = ["Definir escenarios de cuándo 'subir' o 'bajar' este rasgo", "Feedback mensual de 360° enfocado en esta dimensión"]
-        roles = ds["roles_high"][:2] + ds["roles_low"][:1]; not_apt = []
-        expl = "KPI medio: perfil flexible; puede optimizarse con reglas simples de activación según el entorno."
-    return f, r, rec, roles, not_apt, expl
+        h = store.put(REPORT_BUILDERS[fmt](res, fecha, inst), session_id(), "." + fmt)
+        st.session_state._informe = (fp, h)
+    rec, sid = recorder(), session_id()  # read() corre fuera del script: sin acceso a session_state
+    def read():
+        if rec is not None: rec.log("exportar", fmt=fmt)
+        data = store.get(h, sid)
+        return data if data is not None else REPORT_BUILDERS[fmt](res, fecha, inst)
+    return read
+
+# ---------------------------------------------------------------
+# Precalentamiento de matplotlib / Plotly / PdfPages (una vez por proceso)
+# ---------------------------------------------------------------
+WARMUP_MODE = os.environ.get("BIGFIVE_WARMUP", "startup")  # startup | test | off
+
+@st.cache_resource
+def get_warmup():
+    dummy = {d: 50.0 for d in DIM_LIST}
+    return Warmup(default_tasks((lambda: plot_radar(dummy), lambda: plot_bar(dummy)[0],
+                                 lambda: gauge_plotly(50.0, title="Promedio · Moderado"))))
+
+@st.cache_resource
+def get_role_index():
+    return RoleFitIndex.from_results(get_cohort_store().results_path)
+
+# ---------------------------------------------------------------
+# Grabación de la sesión (opcional, BIGFIVE_RECORD_DIR) para replay.py
+# ---------------------------------------------------------------
+def recorder():
+    root = record_dir()
+    if not root: return None
+    rec = st.session_state.get("_grabador")
+    if rec is None:
+        rec = st.session_state._grabador = open_recorder(root, session_id(), q=st.query_params.to_dict(),
+                                                         render=RENDER_MODE, warmup=WARMUP_MODE)
+    return rec
+
+def record(ev:str, **data):
+    rec = recorder()
+    if rec is not None: rec.log(ev, **data)
 
 # ---------------------------------------------------------------
 # Auto-avance: callback SIN doble click (bandera + rerun al final)
 # ---------------------------------------------------------------
 def on_answer_change(qkey:str):
+    t = time.perf_counter()
+    inst = current_instrument()
     st.session_state.answers[qkey] = st.session_state.get(f"resp_{qkey}")
-    idx = KEY2IDX[qkey]
-    if idx < len(QUESTIONS)-1:
+    record("respuesta", k=qkey, r=st.session_state.answers[qkey])
+    idx = inst.key2idx[qkey]
+    shown, t0 = st.session_state._t_item
+    if shown == idx: st.session_state.latencias.push(idx, (t - t0) * 1000.0)
+    if idx < len(inst.questions)-1:
         st.session_state.q_idx = idx + 1
     else:
         st.session_state.stage = "resultados"
         st.session_state.fecha = datetime.now().strftime("%d/%m/%Y %H:%M")
+        # Cohorte e índice usan los nombres del instrumento por defecto (mismos códigos OCEAN)
+        answers = st.session_state.answers; res = inst.canonical(inst.compute_scores(answers))
+        index = get_role_index()  # antes de grabar: si se construye ahora, no debe incluir esta fila
+        rid = get_cohort_store().record(res, answers, area=st.session_state.area, instrumento=inst.key,
+                                        latencias_ms=st.session_state.latencias.per_item(len(inst.questions)))
+        index.add([rid], [[res[d] for d in DIM_LIST]])
     st.session_state._needs_rerun = True  # rerun único al final
 
 # ---------------------------------------------------------------
 # Gráficos (Radar, Barras, Gauge semicircular Plotly)
 # ---------------------------------------------------------------
-def plot_radar(res:dict):
+def plot_radar(res:dict, dims:dict=DIMENSIONES):
     order = list(res.keys())
     vals = [res[d] for d in order]
     fig = go.Figure()
     fig.add_trace(go.Scatterpolar(
-        r=vals, theta=[f"{DIMENSIONES[d]['code']} {d}" for d in order],
+        r=vals, theta=[f"{dims[d]['code']} {d}" for d in order],
         fill='toself', name='Perfil',
         line=dict(width=2, color="#6D597A"),
         fillcolor='rgba(109, 89, 122, .12)',
@@ -474,6 +343,46 @@ def plot_bar(res:dict):
                       yaxis=dict(title=""))
     return fig, df
 
+# Cohorte: mismos estilos que plot_radar/plot_bar, alimentados por agregados
+COHORT_PALETTE = ["#6D597A","#81B29A","#E07A5F","#F2CC8F","#9C6644","#A1C3D1","#B56576","#3D405B"]
+
+def plot_radar_overlay(profiles:dict):
+    """Radar con un trazo por grupo; profiles = {grupo: {dimensión: media}}."""
+    fig = go.Figure()
+    for i, (name, res) in enumerate(profiles.items()):
+        color = COHORT_PALETTE[i % len(COHORT_PALETTE)]
+        fig.add_trace(go.Scatterpolar(
+            r=[res[d] for d in DIM_LIST], theta=[f"{DIMENSIONES[d]['code']} {d}" for d in DIM_LIST],
+            fill='toself', name=name, opacity=.75,
+            line=dict(width=2, color=color), marker=dict(size=6, color=color)
+        ))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0,100])),
+                      showlegend=True, height=520, template="plotly_white")
+    return fig
+
+def plot_hist(stats):
+    """Distribución por dimensión a partir del histograma acumulado (sin filas crudas)."""
+    centers = (HIST_EDGES[:-1] + HIST_EDGES[1:]) / 2
+    fig = go.Figure()
+    for i, d in enumerate(DIM_LIST):
+        fig.add_trace(go.Bar(x=centers, y=stats.hist[i], name=f"{DIMENSIONES[d]['code']} {d}",
+                             marker=dict(color=COHORT_PALETTE[i % len(COHORT_PALETTE)]), opacity=.8))
+    fig.update_layout(barmode="overlay", height=420, template="plotly_white",
+                      xaxis=dict(range=[0,100], title="Puntuación (0–100)"),
+                      yaxis=dict(title="Evaluaciones"))
+    return fig
+
+def plot_trend(months:dict):
+    keys = sorted(months)
+    fig = go.Figure()
+    for i, d in enumerate(DIM_LIST):
+        fig.add_trace(go.Scatter(x=keys, y=[months[k].mean()[d] for k in keys], mode="lines+markers",
+                                 name=f"{DIMENSIONES[d]['code']} {d}",
+                                 line=dict(width=2, color=COHORT_PALETTE[i % len(COHORT_PALETTE)])))
+    fig.update_layout(height=420, template="plotly_white",
+                      yaxis=dict(range=[0,100], title="Media (0–100)"), xaxis=dict(title="Mes"))
+    return fig
+
 def gauge_plotly(value: float, title: str = "", color="#6D597A"):
     """Medidor semicircular (0–100) con aguja."""
     v = max(0, min(100, float(value)))
@@ -504,194 +413,62 @@ def gauge_plotly(value: float, title: str = "", color="#6D597A"):
     )
     return fig
 
-# ---------------------------------------------------------------
-# Exportar (PDF con medidores; HTML si no hay MPL)
-# ---------------------------------------------------------------
-def pdf_semicircle(ax, value, cx=0.5, cy=0.5, r=0.45):
-    """Dibuja un medidor semicircular matplotlib (0–100)."""
-    v = max(0, min(100, float(value)))
-    bands = [(0,25,"#fde2e1"), (25,40,"#fff0c2"), (40,60,"#e9f2fb"),
-             (60,75,"#e7f6e8"), (75,100,"#d9f2db")]
-    for a,b,c in bands:
-        ang1 = 180*(a/100.0); ang2 = 180*(b/100.0)
-        w = Wedge((cx,cy), r, 180-ang2, 180-ang1, facecolor=c, edgecolor="#fff", lw=1)
-        ax.add_patch(w)
+def gauge_svg(value: float, title: str = "", color="#6D597A")->str:
+    """Mismo medidor que gauge_plotly como SVG en línea (sin figura Plotly aparte)."""
     import math
-    theta = math.radians(180*(v/100.0))
-    x2 = cx + r*0.95*math.cos(np.pi - theta)
-    y2 = cy + r*0.95*math.sin(np.pi - theta)
-    ax.plot([cx, x2], [cy, y2], color="#6D597A", lw=3)
-    ax.add_patch(Circle((cx,cy), 0.02, color="#6D597A"))
-    ax.text(cx, cy-0.12, f"{v:.1f}", ha="center", va="center", fontsize=16, color="#111")
-
-def build_pdf(res:dict, fecha:str)->bytes:
-    order = list(res.keys()); vals=[res[d] for d in order]
-    avg = np.mean(vals); std = np.std(vals, ddof=1) if len(vals)>1 else 0.0
-    rng = np.max(vals)-np.min(vals); top = max(res, key=res.get); low = min(res, key=res.get)
-
-    buf = BytesIO()
-    with PdfPages(buf) as pdf:
-        # Portada + KPIs con 3 medidores semicirculares
-        fig = plt.figure(figsize=(8.27,11.69))  # A4
-        ax = fig.add_axes([0,0,1,1]); ax.axis('off')
-        ax.text(.5,.95,"Informe Big Five — Contexto Laboral", ha='center', fontsize=20, fontweight='bold')
-        ax.text(.5,.92,f"Fecha: {fecha}", ha='center', fontsize=11)
-
-        # Tarjetas KPI
-        def card(ax, x,y,w,h,title,val):
-            r = FancyBboxPatch((x,y), w,h, boxstyle="round,pad=0.012,rounding_size=0.018",
-                               edgecolor="#dddddd", facecolor="#ffffff")
-            ax.add_patch(r)
-            ax.text(x+w*0.06, y+h*0.60, title, fontsize=10, color="#333")
-            ax.text(x+w*0.06, y+h*0.25, f"{val}", fontsize=20, fontweight='bold')
-
-        Y0 = .82; H = .10; W = .40; GAP = .02
-        card(ax, .06, Y0, W, H, "Promedio (0–100)", f"{avg:.1f}")
-        card(ax, .54, Y0, W, H, "Desviación estándar", f"{std:.2f}")
-        card(ax, .06, Y0-(H+GAP), W, H, "Rango entre dimensiones", f"{rng:.2f}")
-        card(ax, .54, Y0-(H+GAP), W, H, "Dimensión destacada", f"{top}")
-
-        # Tres medidores (promedio, mejor, menor)
-        axg1 = fig.add_axes([.12, .54, .22, .16]); axg1.axis('off'); pdf_semicircle(axg1, avg, 0.5, 0.0, 0.9); axg1.text(.5,-.35,"Promedio",ha="center",fontsize=10)
-        axg2 = fig.add_axes([.39, .54, .22, .16]); axg2.axis('off'); pdf_semicircle(axg2, res[top], 0.5, 0.0, 0.9); axg2.text(.5,-.35,f"Mayor: {top}",ha="center",fontsize=10)
-        axg3 = fig.add_axes([.66, .54, .22, .16]); axg3.axis('off'); pdf_semicircle(axg3, res[low], 0.5, 0.0, 0.9); axg3.text(.5,-.35,f"Menor: {low}",ha="center",fontsize=10)
-
-        # Lista breve
-        ylist = .46
-        ax.text(.08,ylist,"Resumen ejecutivo", fontsize=14, fontweight='bold'); ylist -= .04
-        bullets = [
-            f"Fortaleza clave: {top} ({res[top]:.1f})",
-            f"Área a potenciar: {low} ({res[low]:.1f})",
-            "Perfil global equilibrado" if 40<=avg<=60 else ("Tendencia alta para ambientes exigentes" if avg>60 else "Perfil conservador, ideal para entornos estables"),
-            f"Variabilidad: DE={std:.2f} · Rango={rng:.2f}",
-        ]
-        for b in bullets:
-            ax.text(.10, ylist, f"• {b}", fontsize=11); ylist -= .03
-
-        pdf.savefig(fig, bbox_inches='tight'); plt.close(fig)
-
-        # Barras
-        fig2 = plt.figure(figsize=(8.27,11.69))
-        a2 = fig2.add_subplot(111)
-        y = np.arange(len(order))
-        a2.barh(y, [res[d] for d in order], color="#81B29A")
-        a2.set_yticks(y); a2.set_yticklabels(order)
-        a2.set_xlim(0,100); a2.set_xlabel("Puntuación (0–100)")
-        a2.set_title("Puntuaciones por dimensión")
-        for i, v in enumerate([res[d] for d in order]):
-            a2.text(v+1, i, f"{v:.1f}", va='center', fontsize=9)
-        pdf.savefig(fig2, bbox_inches='tight'); plt.close(fig2)
-
-        # Análisis por dimensión con medidor
-        for d in order:
-            score = res[d]; lvl, tag = level_label(score)
-            f, r, recs, roles, not_apt, expl = dimension_profile(d, score)
-
-            fig3 = plt.figure(figsize=(8.27,11.69)); ax3 = fig3.add_axes([0,0,1,1]); ax3.axis('off')
-            ax3.text(.5,.95, f"{DIMENSIONES[d]['code']} — {d}", ha='center', fontsize=16, fontweight='bold')
-            ax3.text(.5,.92, f"Puntuación: {score:.1f} · Nivel: {lvl} ({tag})", ha='center', fontsize=11)
-
-            # Gauge de dimensión
-            axg = fig3.add_axes([.18, .80, .64, .14]); axg.axis("off")
-            pdf_semicircle(axg, score, cx=0.5, cy=0.0, r=0.9)
-
-            def draw_list(y, title, items):
-                ax3.text(.08,y,title, fontsize=13, fontweight='bold')
-                yy = y - .03
-                for it in items:
-                    ax3.text(.10, yy, f"• {it}", fontsize=11)
-                    yy -= .03
-                return yy -.02
-
-            ax3.text(.08,.78,"Descripción", fontsize=13, fontweight='bold')
-            ax3.text(.08,.75, DIMENSIONES[d]["desc"], fontsize=11)
-            ax3.text(.08,.71,"Explicativo del KPI", fontsize=13, fontweight='bold')
-            ax3.text(.08,.68, expl, fontsize=11)
-
-            yy = .63
-            yy = draw_list(yy, "Fortalezas (laborales)", f)
-            yy = draw_list(yy, "Riesgos / Cosas a cuidar", r)
-            yy = draw_list(yy, "Recomendaciones", recs)
-            yy = draw_list(yy, "Roles sugeridos", roles)
-            draw_list(yy, "No recomendado para", not_apt if not_apt else ["—"])
-
-            pdf.savefig(fig3, bbox_inches='tight'); plt.close(fig3)
-
-    buf.seek(0)
-    return buf.read()
-
-def build_html(res:dict, fecha:str)->bytes:
-    order = list(res.keys()); vals=[res[d] for d in order]
-    avg=np.mean(vals); std=np.std(vals, ddof=1) if len(vals)>1 else 0.0; rng=np.max(vals)-np.min(vals); top=max(res,key=res.get)
-    rows = ""
-    for d in order:
-        lvl,tag = level_label(res[d])
-        rows += f"<tr><td>{DIMENSIONES[d]['code']}</td><td>{d}</td><td>{res[d]:.1f}</td><td>{lvl}</td><td>{tag}</td></tr>"
-    blocks=""
-    for d in order:
-        score=res[d]; lvl,tag = level_label(score)
-        f,r,recs,roles,not_apt, expl = dimension_profile(d, score)
-        blocks += f"""
-<section style="border:1px solid #eee; border-radius:12px; padding:14px; margin:14px 0;">
-  <h3 style="margin:.2rem 0;">{DIMENSIONES[d]['code']} — {d} <span class='tag'>{score:.1f} · {lvl} ({tag})</span></h3>
-  <p style="margin:.25rem 0; color:#333;">{DIMENSIONES[d]["desc"]}</p>
-  <h4>Explicativo del KPI</h4>
-  <p>{expl}</p>
-  <div style="display:grid; grid-template-columns: repeat(auto-fit, minmax(220px,1fr)); gap:12px;">
-    <div><h4>Fortalezas</h4><ul>{''.join([f'<li>{x}</li>' for x in f])}</ul></div>
-    <div><h4>Riesgos</h4><ul>{''.join([f'<li>{x}</li>' for x in r])}</ul></div>
-    <div><h4>Recomendaciones</h4><ul>{''.join([f'<li>{x}</li>' for x in recs])}</ul></div>
-  </div>
-  <div style="display:grid; grid-template-columns: repeat(auto-fit, minmax(220px,1fr)); gap:12px; margin-top:10px;">
-    <div><h4>Roles sugeridos</h4><ul>{''.join([f'<li>{x}</li>' for x in roles])}</ul></div>
-    <div><h4>No recomendado para</h4><ul>{''.join([f'<li>{x}</li>' for x in (not_apt if not_apt else ['—'])])}</ul></div>
-  </div>
-</section>
-"""
-    html=f"""<!doctype html>
-<html><head><meta charset="utf-8" />
-<title>Informe Big Five Laboral</title>
-<style>
-body{{font-family:Inter,Arial; margin:24px; color:#111;}}
-h1{{font-size:24px; margin:0 0 8px 0;}}
-h3{{font-size:18px; margin:.2rem 0;}}
-h4{{font-size:15px; margin:.2rem 0;}}
-table{{border-collapse:collapse; width:100%; margin-top:8px}}
-th,td{{border:1px solid #eee; padding:8px; text-align:left;}}
-.tag{{display:inline-block; padding:.2rem .6rem; border:1px solid #eee; border-radius:999px; font-size:.82rem;}}
-.kpi-grid{{display:grid; grid-template-columns:repeat(auto-fit,minmax(220px,1fr)); gap:12px; margin:10px 0 6px 0;}}
-.kpi{{border:1px solid #eee; border-radius:12px; padding:12px; background:#fff;}}
-.kpi .label{{font-size:13px; opacity:.85}}
-.kpi .value{{font-size:22px; font-weight:800}}
-@media print{{ .no-print{{display:none}} }}
-</style>
-</head>
-<body>
-<h1>Informe Big Five — Contexto Laboral</h1>
-<p>Fecha: <b>{fecha}</b></p>
-<div class="kpi-grid">
-  <div class="kpi"><div class="label">Promedio general (0–100)</div><div class="value">{avg:.1f}</div></div>
-  <div class="kpi"><div class="label">Desviación estándar</div><div class="value">{std:.2f}</div></div>
-  <div class="kpi"><div class="label">Rango</div><div class="value">{rng:.2f}</div></div>
-  <div class="kpi"><div class="label">Dimensión destacada</div><div class="value">{top}</div></div>
-</div>
-
-<h3>Tabla resumen</h3>
-<table>
-  <thead><tr><th>Código</th><th>Dimensión</th><th>Puntuación</th><th>Nivel</th><th>Etiqueta</th></tr></thead>
-  <tbody>{rows}</tbody>
-</table>
-
-<h3>Análisis por dimensión (laboral)</h3>
-{blocks}
-
-<div class="no-print" style="margin-top:16px;">
-  <button onclick="window.print()" style="padding:10px 14px; border:1px solid #ddd; background:#f9f9f9; border-radius:8px; cursor:pointer;">
-    Imprimir / Guardar como PDF
-  </button>
-</div>
-</body></html>"""
-    return html.encode("utf-8")
+    v = max(0, min(100, float(value)))
+    def xy(x, r):
+        t = math.pi * (1 - x / 100.0)
+        return 100 + r*math.cos(t), 100 - r*math.sin(t)
+    def pt(x, r): return "{:.2f},{:.2f}".format(*xy(x, r))
+    nx, ny = xy(v, 85)
+    bounds = [0, 25, 40, 60, 75, 100]
+    colors = ["#fde2e1", "#fff0c2", "#e9f2fb", "#e7f6e8", "#d9f2db"]
+    arcs = "".join(
+        f'<path d="M{pt(a,90)} A90,90 0 0 1 {pt(b,90)} L{pt(b,54)} A54,54 0 0 0 {pt(a,54)} Z" '
+        f'fill="{c}" stroke="#fff" stroke-width="1"/>'
+        for a, b, c in zip(bounds, bounds[1:], colors)
+    )
+    return (f'<svg class="dim-gauge" viewBox="0 0 200 145" role="img" aria-label="{v:.1f}">{arcs}'
+            f'<line x1="100" y1="100" x2="{nx:.2f}" y2="{ny:.2f}" '
+            f'stroke="{color}" stroke-width="4" stroke-linecap="round"/>'
+            f'<circle cx="100" cy="100" r="4" fill="{color}"/>'
+            f'<text x="100" y="124" text-anchor="middle" font-size="22" font-weight="800" fill="#111">{v:.1f}</text>'
+            f'<text x="100" y="141" text-anchor="middle" font-size="12" fill="#333">{title}</text></svg>')
+
+def dim_card_html(inst, d:str, score:float)->str:
+    """Tarjeta completa de una dimensión (cabecera, medidor, textos y listas) en un solo bloque HTML."""
+    lvl, tag = inst.level_label(score)
+    f, r, recs, roles, not_apt, expl = inst.dimension_profile(d, score)
+    ds = inst.dims[d]
+    def section(title, items):
+        lis = "".join(f"<li>{x}</li>" for x in (items or ["—"]))
+        return f'<div class="dim-section"><h4>{title}</h4><ul class="dim-list">{lis}</ul></div>'
+    return f"""
+    <div class="dim-card" style="margin-bottom:1rem;">
+      <div class="dim-card-header pastel-{ds['code']}">
+        <div class="dim-chip">{ds['icon']} {ds['code']}</div>
+        <div class="dim-title-row" style="flex:1;">
+          <h3 class="dim-title-name" style="margin:0;">{d}</h3>
+          <div class="badge">{score:.1f} · {lvl} · {tag}</div>
+        </div>
+      </div>
+      <div class="dim-body">
+        {gauge_svg(score, title=f"{lvl} · {tag}", color=ds["color"])}
+        <div class="dim-grid">
+          <div class="dim-section">
+            <h4>Descripción</h4><p class="small">{ds['desc']}</p>
+            <h4>Explicativo del KPI</h4><p class="small">{expl}</p>
+          </div>
+          {section("✅ Fortalezas (laborales)", f)}
+          {section("⚠️ Riesgos / Cosas a cuidar", r)}
+          {section("🛠️ Recomendaciones", recs)}
+          {section("🎯 Roles sugeridos", roles)}
+          {section("⛔ No recomendado para", not_apt)}
+        </div>
+      </div>
+    </div>
+    """
 
 # ---------------------------------------------------------------
 # Vistas
@@ -709,20 +486,19 @@ def view_inicio():
         </div>
         """, unsafe_allow_html=True
     )
+    registry = get_registry()
+    inst = registry.get(st.session_state.get("instrumento_sel", st.session_state.instrumento))
     c1, c2 = st.columns([1.35,1])
     with c1:
+        dims_html = "".join(f"<li><b>{ds['code']}</b> {d}</li>" for d, ds in inst.dims.items())
         st.markdown(
-            """
+            f"""
             <div class="card">
               <h3 style="margin-top:0">¿Qué mide?</h3>
               <ul style="line-height:1.6">
-                <li><b>O</b> Apertura a la Experiencia</li>
-                <li><b>C</b> Responsabilidad</li>
-                <li><b>E</b> Extraversión</li>
-                <li><b>A</b> Amabilidad</li>
-                <li><b>N</b> Estabilidad Emocional</li>
+                {dims_html}
               </ul>
-              <p class="small">50 ítems Likert (1–5) · Autoavance · Duración estimada: <b>8–12 min</b>.</p>
+              <p class="small">{len(inst.questions)} ítems Likert ({inst.lo}–{inst.hi}) · Autoavance · Duración estimada: <b>{max(1, round(len(inst.questions)*0.16))}–{max(2, round(len(inst.questions)*0.24))} min</b>.</p>
             </div>
             """, unsafe_allow_html=True
         )
@@ -739,31 +515,44 @@ def view_inicio():
             </div>
             """, unsafe_allow_html=True
         )
+        options = registry.options()
+        if len(options) > 1:
+            st.selectbox("Instrumento", list(options), format_func=options.get,
+                         index=list(options).index(inst.key), key="instrumento_sel")
+        area = st.text_input("Área / Departamento (opcional)", value=st.session_state.area,
+                             placeholder="Ej.: Operaciones, Ventas, TI")
         if st.button(" Iniciar evaluación", type="primary", use_container_width=True):
+            st.session_state.area = area.strip()
+            st.session_state.instrumento = inst.key
+            record("iniciar", inst=inst.key, area=st.session_state.area)
             st.session_state.stage = "test"
             st.session_state.q_idx = 0
-            st.session_state.answers = {q["key"]:None for q in QUESTIONS}
+            st.session_state.answers = {q["key"]:None for q in inst.questions}
+            st.session_state.latencias = LatencyRing()
             st.session_state.fecha = None
             st.rerun()
 
 def view_test():
+    inst = current_instrument()
     i = st.session_state.q_idx
-    q = QUESTIONS[i]
-    dim = q["dim"]; code = DIMENSIONES[dim]["code"]; icon = DIMENSIONES[dim]["icon"]
-    p = (i+1)/len(QUESTIONS)
-    st.progress(p, text=f"Progreso: {i+1}/{len(QUESTIONS)}")
+    q = inst.questions[i]
+    if st.session_state._t_item[0] != i:  # primer render de este ítem: inicia el cronómetro
+        st.session_state._t_item = (i, time.perf_counter())
+    dim = q["dim"]; code = inst.dims[dim]["code"]; icon = inst.dims[dim]["icon"]
+    p = (i+1)/len(inst.questions)
+    st.progress(p, text=f"Progreso: {i+1}/{len(inst.questions)}")
     st.markdown(f"<div class='dim-title'>{icon} {code} — {dim}</div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='dim-desc'>{DIMENSIONES[dim]['desc']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='dim-desc'>{inst.dims[dim]['desc']}</div>", unsafe_allow_html=True)
     st.markdown("---")
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown(f"### {i+1}. {q['text']}")
     prev = st.session_state.answers.get(q["key"])
-    prev_idx = None if prev is None else LIK_KEYS.index(prev)
+    prev_idx = None if prev is None else inst.lik_keys.index(prev)
     st.radio(
         "Selecciona una opción",
-        options=LIK_KEYS,
+        options=inst.lik_keys,
         index=prev_idx,
-        format_func=lambda x: LIKERT[x],
+        format_func=lambda x: inst.likert[x],
         key=f"resp_{q['key']}",
         horizontal=True,
         label_visibility="collapsed",
@@ -773,7 +562,8 @@ def view_test():
     st.markdown("</div>", unsafe_allow_html=True)
 
 def view_resultados():
-    res = compute_scores(st.session_state.answers)
+    inst = current_instrument()
+    res = inst.compute_scores(st.session_state.answers)
     order = list(res.keys()); vals=[res[d] for d in order]
     avg = round(float(np.mean(vals)),1)
     std = round(float(np.std(vals, ddof=1)),2) if len(vals)>1 else 0.0
@@ -791,18 +581,24 @@ def view_resultados():
     )
 
     # KPIs
-    st.markdown("<div class='kpi-grid'>", unsafe_allow_html=True)
-    st.markdown(f"<div class='kpi'><div class='label'>Promedio general (0–100)</div><div class='value countup' data-target='{avg:.1f}'>{avg:.1f}</div></div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='kpi'><div class='label'>Desviación estándar</div><div class='value countup' data-target='{std:.2f}'>{std:.2f}</div></div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='kpi'><div class='label'>Rango</div><div class='value countup' data-target='{rng:.2f}'>{rng:.2f}</div></div>", unsafe_allow_html=True)
-    st.markdown(f"<div class='kpi'><div class='label'>Dimensión destacada</div><div class='value'>{top}</div></div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    kpis = [
+        f"<div class='kpi'><div class='label'>Promedio general (0–100)</div><div class='value countup' data-target='{avg:.1f}'>{avg:.1f}</div></div>",
+        f"<div class='kpi'><div class='label'>Desviación estándar</div><div class='value countup' data-target='{std:.2f}'>{std:.2f}</div></div>",
+        f"<div class='kpi'><div class='label'>Rango</div><div class='value countup' data-target='{rng:.2f}'>{rng:.2f}</div></div>",
+        f"<div class='kpi'><div class='label'>Dimensión destacada</div><div class='value'>{top}</div></div>",
+    ]
+    if RENDER_MODE == "consolidado":
+        st.markdown("<div class='kpi-grid'>" + "".join(kpis) + "</div>", unsafe_allow_html=True)
+    else:
+        st.markdown("<div class='kpi-grid'>", unsafe_allow_html=True)
+        for k in kpis: st.markdown(k, unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown("---")
     c1, c2 = st.columns(2)
     with c1:
         st.subheader(" Radar del perfil")
-        st.plotly_chart(plot_radar(res), use_container_width=True)
+        st.plotly_chart(plot_radar(res, inst.dims), use_container_width=True)
     with c2:
         st.subheader(" Puntuaciones por dimensión")
         fig_bar, df_sorted = plot_bar(res)
@@ -811,11 +607,11 @@ def view_resultados():
     st.markdown("---")
     st.subheader(" Resumen de resultados")
     tabla = pd.DataFrame({
-        "Código":[DIMENSIONES[d]["code"] for d in order],
+        "Código":[inst.dims[d]["code"] for d in order],
         "Dimensión":order,
         "Puntuación":[f"{res[d]:.1f}" for d in order],
-        "Nivel":[level_label(res[d])[0] for d in order],
-        "Etiqueta":[level_label(res[d])[1] for d in order],
+        "Nivel":[inst.level_label(res[d])[0] for d in order],
+        "Etiqueta":[inst.level_label(res[d])[1] for d in order],
     })
     st.dataframe(tabla, use_container_width=True, hide_index=True)
 
@@ -823,22 +619,17 @@ def view_resultados():
     st.markdown("---")
     st.subheader(" Análisis por dimensión (laboral)")
 
-    pastel_class = {
-        "Apertura a la Experiencia":"pastel-O",
-        "Responsabilidad":"pastel-C",
-        "Extraversión":"pastel-E",
-        "Amabilidad":"pastel-A",
-        "Estabilidad Emocional":"pastel-N",
-    }
-
-    for d in DIM_LIST:
-        score = res[d]; lvl, tag = level_label(score)
-        f, r, recs, roles, not_apt, expl = dimension_profile(d, score)
-        icon = DIMENSIONES[d]["icon"]; code = DIMENSIONES[d]["code"]
+    for d in inst.dim_list:
+        if RENDER_MODE == "consolidado":
+            st.markdown(dim_card_html(inst, d, res[d]), unsafe_allow_html=True)
+            continue
+        score = res[d]; lvl, tag = inst.level_label(score)
+        f, r, recs, roles, not_apt, expl = inst.dimension_profile(d, score)
+        icon = inst.dims[d]["icon"]; code = inst.dims[d]["code"]
         with st.container():
             st.markdown(f"""
             <div class="dim-card">
-              <div class="dim-card-header {pastel_class[d]}">
+              <div class="dim-card-header pastel-{code}">
                 <div class="dim-chip">{icon} {code}</div>
                 <div class="dim-title-row" style="flex:1;">
                   <h3 class="dim-title-name" style="margin:0;">{d}</h3>
@@ -849,14 +640,14 @@ def view_resultados():
             """, unsafe_allow_html=True)
 
             # Medidor semicircular (Plotly)
-            st.plotly_chart(gauge_plotly(score, title=f"{lvl} · {tag}", color=DIMENSIONES[d]["color"]),
+            st.plotly_chart(gauge_plotly(score, title=f"{lvl} · {tag}", color=inst.dims[d]["color"]),
                             use_container_width=True)
 
             st.markdown("""
                 <div class="dim-grid">
                   <div class="dim-section">
                     <h4>Descripción</h4>
-                    <p class="small">""" + DIMENSIONES[d]["desc"] + """</p>
+                    <p class="small">""" + inst.dims[d]["desc"] + """</p>
                     <h4>Explicativo del KPI</h4>
                     <p class="small">""" + expl + """</p>
                   </div>
@@ -891,20 +682,18 @@ def view_resultados():
     st.subheader("📥 Exportar informe")
 
     if HAS_MPL:
-        pdf_bytes = build_pdf(res, st.session_state.fecha)
         st.download_button(
             "⬇️ Descargar PDF (con medidores)",
-            data=pdf_bytes,
+            data=report_download(res, inst, "pdf"),
             file_name="Informe_BigFive_Laboral.pdf",
             mime="application/pdf",
             use_container_width=True,
             type="primary"
         )
     else:
-        html_bytes = build_html(res, st.session_state.fecha)
         st.download_button(
             "⬇️ Descargar Reporte (HTML) — Imprime como PDF",
-            data=html_bytes,
+            data=report_download(res, inst, "html"),
             file_name="Informe_BigFive_Laboral.html",
             mime="text/html",
             use_container_width=True,
@@ -916,14 +705,160 @@ def view_resultados():
     if st.button("🔄 Nueva evaluación", type="primary", use_container_width=True):
         st.session_state.stage = "inicio"
         st.session_state.q_idx = 0
-        st.session_state.answers = {q["key"]:None for q in QUESTIONS}
+        st.session_state.answers = {q["key"]:None for q in inst.questions}
+        st.session_state.latencias = LatencyRing()
         st.session_state.fecha = None
+        st.session_state.pop("_informe", None)
+        st.session_state.pop("_t_vista_ms", None)
+        get_payload_store().release(session_id())
+        record("nueva")
         st.rerun()
 
+def view_admin_login():
+    st.markdown(
+        """
+        <div class="card">
+          <h1 style="margin:0 0 6px 0; font-size:clamp(2.2rem,3.8vw,3rem); font-weight:900;">🔒 Acceso de gestión</h1>
+          <p class="small" style="margin:0;">Ingresa la clave de gestión para ver la analítica de cohorte.</p>
+        </div>
+        """, unsafe_allow_html=True
+    )
+    st.text_input("Clave de gestión", type="password", key="_clave_admin", on_change=on_admin_login)
+    if st.session_state.get("_admin_fallo"): st.error("Clave incorrecta.")
+
+def view_cohorte():
+    """Dashboard de gestión: solo lee agregados, su costo no depende del tamaño de la cohorte."""
+    agg = get_cohort_store().snapshot()
+    st.markdown(
+        """
+        <div class="card">
+          <h1 style="margin:0 0 6px 0; font-size:clamp(2.2rem,3.8vw,3rem); font-weight:900;">👥 Analítica de cohorte</h1>
+          <p class="small" style="margin:0;">Agregados acumulados de todas las evaluaciones completadas.</p>
+        </div>
+        """, unsafe_allow_html=True
+    )
+    total = agg.groups.get(ALL)
+    if total is None:
+        st.info("Aún no hay evaluaciones completadas.")
+        return
+    figs = cohort_figures(agg.version)
+
+    areas = sorted(k for k in agg.groups if k != ALL)
+    st.markdown("<div class='kpi-grid'>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi'><div class='label'>Evaluaciones</div><div class='value'>{total.count}</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi'><div class='label'>Áreas</div><div class='value'>{len(areas)}</div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi'><div class='label'>Meses con datos</div><div class='value'>{len(agg.months)}</div></div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("---")
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader(" Radar por área")
+        st.plotly_chart(figs["radar"], use_container_width=True)
+    with c2:
+        st.subheader(" Distribución por dimensión")
+        st.plotly_chart(figs["hist"], use_container_width=True)
+
+    st.markdown("---")
+    st.subheader(" Promedios por área")
+    st.dataframe(figs["tabla"], use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.subheader(" Tendencia mensual")
+    st.plotly_chart(figs["trend"], use_container_width=True)
+
+    st.markdown("---")
+    st.subheader(" Ranking por ajuste a rol")
+    index = get_role_index()
+    c1, c2, c3, c4 = st.columns([1.4, .6, 1, 1.2])
+    with c1: role = st.selectbox("Rol", sorted(index.profiles))
+    with c2: k = st.number_input("Top-k", min_value=1, max_value=200, value=10)
+    with c3: fdim = st.selectbox("Filtrar dimensión", ["—"] + DIM_LIST)
+    with c4: flevels = st.multiselect("Niveles permitidos", [lvl for lvl, _ in LEVELS], disabled=fdim == "—")
+    bands = {fdim: flevels} if fdim != "—" and flevels else None
+    ranking = index.top_k(role, int(k), bands)
+    st.dataframe(pd.DataFrame([
+        {"#": i, "ID": cid, "Ajuste": fit, **{DIMENSIONES[d]["code"]: v for d, v in res.items()}}
+        for i, (cid, fit, res) in enumerate(ranking, 1)
+    ]), use_container_width=True, hide_index=True)
+    if len(ranking) > 1:
+        finalists = [(f"#{i} · {str(cid)[:8]}", res) for i, (cid, _, res) in enumerate(ranking[:MAX_CANDIDATES], 1)]
+        fmt = "pdf" if HAS_MPL else "html"
+        build = build_comparison_pdf if HAS_MPL else build_comparison_html
+        fecha = datetime.now().strftime("%d/%m/%Y %H:%M")
+        st.download_button(
+            f"📄 Informe comparativo ({len(finalists)} finalistas, {fmt.upper()})",
+            data=lambda: build(finalists, fecha),   # se genera solo al pulsar
+            file_name=f"Comparativo_BigFive_{role}.{fmt}",
+            mime="application/pdf" if HAS_MPL else "text/html",
+        )
+
+    with st.expander("💾 Memoria de informes descargables"):
+        m = get_payload_store().metrics()
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("En disco", f"{m['bytes']/2**20:.1f} / {m['max_bytes']/2**20:.0f} MB")
+        c2.metric("Informes", m["files"])
+        c3.metric("Deduplicados", m["dedup"])
+        c4.metric("Expulsados", m["evicted"])
+        st.caption(f"TTL {m['ttl']/60:.0f} min · {m['reads']} descargas servidas ({m['read_bytes']/2**20:.1f} MB leídos)")
+        if m["sessions"]:
+            st.dataframe(pd.DataFrame([{"Sesión": sid[:8], "KB": round(b / 1024, 1)}
+                                       for sid, b in sorted(m["sessions"].items(), key=lambda kv: -kv[1])]),
+                         use_container_width=True, hide_index=True)
+
+    with st.expander("⏱️ Precalentamiento de render"):
+        w = get_warmup()
+        st.caption(f"Modo {WARMUP_MODE} · estado: {w.state}")
+        rows = [{"Paso": name, "ms": ms} for name, ms in w.timings.items()]
+        if w.first_view_ms is not None:
+            rows.append({"Paso": "primera vista de resultados", "ms": w.first_view_ms})
+        if rows: st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        for name, err in w.errors.items(): st.warning(f"{name}: {err}")
+
+    with st.expander("📡 Tráfico al navegador por rerun"):
+        rows = get_stage_stats().rows()
+        st.caption(f"Modo de render: {RENDER_MODE} (cámbialo con ?render=clasico|consolidado o BIGFIVE_RENDER) · "
+                   "medias por rerun; «reutilizable» es lo que el navegador ya tiene en su caché")
+        if meter_disabled(): st.warning(f"Medición desactivada: {meter_disabled()}")
+        if rows:
+            st.dataframe(pd.DataFrame([{"Etapa": r["stage"], "Reruns": r["reruns"], "Elementos": round(r["elements"], 1),
+                                        "KB enviados": round(r["bytes"] / 1024, 1),
+                                        "KB reutilizables": round(r["cacheable"] / 1024, 1),
+                                        "Referencias": round(r["refs"], 1)} for r in rows]),
+                         use_container_width=True, hide_index=True)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def cohort_figures(version:int):
+    """Figuras del dashboard; se recalculan solo cuando llega un resultado nuevo (version)."""
+    agg = get_cohort_store().snapshot()
+    rows = []
+    for name, g in sorted(agg.groups.items(), key=lambda kv: (kv[0] != ALL, kv[0])):
+        mean, std = g.mean(), g.std()
+        rows.append({"Área": name, "N": g.count,
+                     **{f"{DIMENSIONES[d]['code']} media": mean[d] for d in DIM_LIST},
+                     **{f"{DIMENSIONES[d]['code']} DE": std[d] for d in DIM_LIST}})
+    return {
+        "radar": plot_radar_overlay({name: g.mean() for name, g in agg.groups.items()}),
+        "hist": plot_hist(agg.groups[ALL]),
+        "trend": plot_trend(agg.months),
+        "tabla": pd.DataFrame(rows),
+    }
+
 # ---------------------------------------------------------------
 # FLUJO PRINCIPAL
 # ---------------------------------------------------------------
-if st.session_state.stage == "inicio":
+if WARMUP_MODE == "startup" or (WARMUP_MODE == "test" and st.session_state.stage == "test"):
+    get_warmup().start()
+
+if recorder() is not None and st.session_state.get("_etapa_grabada") != _stage:
+    record("etapa", a=_stage)
+    st.session_state._etapa_grabada = _stage
+
+if ADMIN_VIEW:
+    # Vista de gestión: ?vista=cohorte + clave
+    if st.session_state.get("_admin"): view_cohorte()
+    else: view_admin_login()
+elif st.session_state.stage == "inicio":
     view_inicio()
 elif st.session_state.stage == "test":
     view_test()
@@ -931,7 +866,18 @@ else:
     # Entramos aquí si se completó o si el usuario recargó tras finalizar
     if st.session_state.fecha is None:
         st.session_state.fecha = datetime.now().strftime("%d/%m/%Y %H:%M")
+    t0 = time.perf_counter()
     view_resultados()
+    ms = (time.perf_counter() - t0) * 1000
+    st.session_state.setdefault("_t_vista_ms", ms)  # primera vista de resultados de esta sesión
+    get_warmup().record_view(ms)
+    record("vista", ms=round(ms, 1), sigue=st.session_state._needs_rerun)  # sigue: rerun automático a continuación
+
+# Fin del rerun para el medidor: el último de la sesión no tiene un begin() siguiente que lo cierre
+st.session_state._medidor.finish()
+
+# Fin del rerun para el medidor: el último de la sesión no tiene un begin() siguiente que lo cierre
+st.session_state._medidor.finish()
 
 # Rerun único si el callback de la radio lo marcó
 if st.session_state._needs_rerun:
@@ -0,0 +1,155 @@
+# ================================================================
+#  Big Five — Telemetría de latencia por ítem + detección de
+#  respuestas descuidadas (vectorizada sobre muchas sesiones)
+#  Uso: python telemetry.py                 (sobre data/resultados.jsonl)
+#       python telemetry.py --items         (ítems más lentos)
+# ================================================================
+import argparse
+import os
+from array import array
+
+import numpy as np
+
+from bigfive import BUILTIN, QUESTIONS, REV_MASK, DIM_ONEHOT, answers_matrix
+from cohort import iter_results
+
+# ---------------------------------------------------------------
+# Captura (ruta del click): buffer circular de tamaño fijo
+# ---------------------------------------------------------------
+class LatencyRing:
+    """Últimos `size` eventos (índice de ítem, latencia en ms) sin asignaciones por click."""
+    __slots__ = ("size", "items", "ms", "pos", "count")
+
+    def __init__(self, size:int=64):
+        self.size = size
+        self.items = array("h", [-1]) * size
+        self.ms = array("f", [0.0]) * size
+        self.pos = 0
+        self.count = 0
+
+    def push(self, item:int, ms:float):
+        i = self.pos
+        self.items[i] = item; self.ms[i] = ms
+        self.pos = (i + 1) % self.size
+        self.count += 1
+
+    def events(self)->list:
+        """Eventos en orden cronológico (los más antiguos se pierden al desbordar)."""
+        n = min(self.count, self.size)
+        start = (self.pos - n) % self.size
+        return [(self.items[(start + j) % self.size], self.ms[(start + j) % self.size]) for j in range(n)]
+
+    def per_item(self, n_items:int=len(QUESTIONS))->list:
+        """Latencia acumulada por ítem (ms, redondeada); None si no hay registro."""
+        out = [None] * n_items
+        for item, ms in self.events():
+            if 0 <= item < n_items: out[item] = round((out[item] or 0.0) + ms, 1)
+        return out
+
+# ---------------------------------------------------------------
+# Detección por lotes
+# ---------------------------------------------------------------
+DEFAULT_THRESHOLDS = {
+    "longstring": 10,          # misma opción en ≥10 ítems seguidos
+    "irv_min": 0.5,            # DE intra-individual de las respuestas crudas
+    "seconds_per_item": 1.0,   # mediana por ítem por debajo de esto = demasiado rápido
+    "consistency_min": 0.3,    # even/odd (directos vs invertidos) con Spearman-Brown
+}
+
+def longstring(A:np.ndarray)->np.ndarray:
+    """Racha máxima de respuestas idénticas consecutivas (orden de QUESTIONS)."""
+    n, m = A.shape
+    idx = np.arange(m)
+    brk = np.ones((n, m), dtype=bool)
+    brk[:, 1:] = (A[:, 1:] != A[:, :-1]) | (A[:, 1:] == 0)
+    start = np.maximum.accumulate(np.where(brk, idx, 0), axis=1)
+    run = np.where(A == 0, 0, idx - start + 1)
+    return run.max(axis=1)
+
+def irv(A:np.ndarray)->np.ndarray:
+    """Variabilidad intra-individual: DE de las respuestas crudas contestadas."""
+    X = np.where(A == 0, np.nan, A.astype(np.float64))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nanstd(X, axis=1, ddof=1)
+
+def half_consistency(A:np.ndarray)->np.ndarray:
+    """Correlación entre dimensiones de las mitades directa e invertida (Spearman-Brown).
+
+    Cada dimensión se puntúa por separado con sus ítems directos y con sus ítems
+    invertidos; quien responde con atención produce ambos perfiles parecidos.
+    """
+    X = np.where(A == 0, np.nan, A.astype(np.float64))
+    X = np.where(REV_MASK, 6.0 - X, X)
+    def half(mask):
+        V = np.where(mask, X, np.nan)
+        filled = np.nan_to_num(V) @ DIM_ONEHOT
+        counts = (~np.isnan(V)).astype(np.float64) @ DIM_ONEHOT
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return filled / counts
+    D, R = half(~REV_MASK), half(REV_MASK)
+    D = D - D.mean(axis=1, keepdims=True); R = R - R.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (D * R).sum(axis=1) / np.sqrt((D * D).sum(axis=1) * (R * R).sum(axis=1))
+        # Perfil plano en alguna mitad: correlación indefinida, se deja NaN (r = -1 da -inf -> -1)
+        return np.clip(np.where(np.isnan(r), np.nan, 2 * r / (1 + r)), -1.0, 1.0)
+
+def detect_careless(A:np.ndarray, L:np.ndarray|None=None, thresholds:dict|None=None)->dict:
+    """Índices y banderas por sesión. A: (N × 50) int8 (0 = sin respuesta); L: (N × 50) ms o NaN."""
+    th = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    A = np.asarray(A)
+    out = {"longstring": longstring(A), "irv": irv(A), "consistency": half_consistency(A)}
+    out["flag_longstring"] = out["longstring"] >= th["longstring"]
+    out["flag_irv"] = out["irv"] < th["irv_min"]
+    c = out["consistency"]
+    out["flag_consistency"] = ~np.isnan(c) & (c < th["consistency_min"])  # NaN (perfil plano) no marca
+    if L is not None:
+        L = np.asarray(L, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            out["median_ms"] = np.nanmedian(L, axis=1)
+            out["total_s"] = np.nansum(L, axis=1) / 1000.0
+        out["flag_fast"] = out["median_ms"] < th["seconds_per_item"] * 1000
+    flags = [k for k in out if k.startswith("flag_")]
+    out["n_flags"] = np.sum([out[k] for k in flags], axis=0)
+    return out
+
+def item_latency_summary(L:np.ndarray)->list:
+    """[(clave, mediana ms, p90 ms)] ordenado del ítem más lento al más rápido."""
+    with np.errstate(all="ignore"):
+        med = np.nanmedian(L, axis=0); p90 = np.nanpercentile(L, 90, axis=0)
+    order = np.argsort(-np.nan_to_num(med, nan=-1))
+    return [(QUESTIONS[j]["key"], float(med[j]), float(p90[j])) for j in order]
+
+def load_sessions(results_path:str):
+    """(ids, A, L) desde el JSONL de resultados; L en NaN donde no hay latencia.
+
+    Solo sesiones del instrumento por defecto: otros packs tienen otro número de ítems.
+    """
+    ids, answers, lats = [], [], []
+    for row, _ in iter_results(results_path, instrumento=BUILTIN.key):
+        ids.append(row["id"]); answers.append(row["answers"])
+        lats.append([np.nan if v is None else v for v in row.get("latencias_ms") or [None] * len(QUESTIONS)])
+    return ids, answers_matrix(answers), np.array(lats, dtype=np.float64).reshape(len(ids), len(QUESTIONS))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Detección de respuestas descuidadas y latencias por ítem.")
+    ap.add_argument("--data-dir", default=os.environ.get("BIGFIVE_DATA_DIR", "data"))
+    ap.add_argument("--items", action="store_true", help="Muestra los ítems más lentos")
+    ap.add_argument("--all", action="store_true", help="Lista todas las sesiones, no solo las marcadas")
+    args = ap.parse_args(argv)
+
+    ids, A, L = load_sessions(os.path.join(args.data_dir, "resultados.jsonl"))
+    if args.items:
+        for key, med, p90 in item_latency_summary(L)[:15]:
+            print(f"{key:4s} mediana={med/1000:6.2f}s p90={p90/1000:6.2f}s")
+        return
+    rep = detect_careless(A, L)
+    print(f"{len(ids)} sesiones · {int((rep['n_flags'] > 0).sum())} con alguna bandera")
+    for i, cid in enumerate(ids):
+        if not args.all and rep["n_flags"][i] == 0: continue
+        marks = [k[5:] for k in rep if k.startswith("flag_") and rep[k][i]]
+        print(f"{cid}  longstring={rep['longstring'][i]:2d} irv={rep['irv'][i]:.2f} "
+              f"consistencia={rep['consistency'][i]:.2f} mediana={rep['median_ms'][i]/1000:.2f}s  "
+              f"{','.join(marks) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# ================================================================
+#  Big Five — Precalentamiento de los motores de render
+#  Una vez por proceso y en segundo plano: dibuja un medidor, unas
+#  barras y una página PDF descartables (matplotlib) y serializa las
+#  figuras Plotly de la app, para que la primera vista de resultados
+#  no pague la carga de fuentes, plantillas y backend.
+# ================================================================
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+
+from bigfive import HAS_MPL, DIM_LIST, pdf_semicircle
+
+def warm_matplotlib():
+    """Medidor + barras + texto en una página PDF descartable (sin pyplot: no toca su estado global)."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+    fig = Figure(figsize=(8.27, 11.69))
+    ax = fig.add_axes([0, 0, 1, 1]); ax.axis("off")
+    ax.text(.5, .95, "Informe Big Five — Contexto Laboral", ha="center", fontsize=20, fontweight="bold")
+    ax.text(.08, .90, "• Fortalezas (laborales)", fontsize=11)
+    axg = fig.add_axes([.18, .70, .64, .14]); axg.axis("off")
+    pdf_semicircle(axg, 50.0, cx=0.5, cy=0.0, r=0.9)
+    axb = fig.add_axes([.30, .15, .60, .45])
+    y = np.arange(len(DIM_LIST))
+    axb.barh(y, np.full(len(DIM_LIST), 50.0), color="#81B29A")
+    axb.set_yticks(y); axb.set_yticklabels(DIM_LIST)
+    axb.set_xlim(0, 100); axb.set_xlabel("Puntuación (0–100)"); axb.set_title("Puntuaciones por dimensión")
+    with PdfPages(BytesIO()) as pdf:
+        pdf.savefig(fig, bbox_inches="tight")
+
+def warm_plotly(figures):
+    """Construye y serializa las figuras igual que st.plotly_chart (plantilla + validadores)."""
+    import plotly.io as pio
+    for make in figures:
+        pio.to_json(make(), validate=False)
+
+class Warmup:
+    """Tareas de precalentamiento en un hilo daemon; `start` solo tiene efecto la primera vez."""
+    def __init__(self, tasks:dict):
+        self.tasks = tasks
+        self.timings = {}   # tarea -> ms
+        self.errors = {}    # tarea -> repr(excepción)
+        self.first_view_ms = None
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None: return
+            self.thread = threading.Thread(target=self._run, name="bigfive-warmup", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        for name, task in self.tasks.items():
+            t0 = time.perf_counter()
+            try:
+                task()
+            except Exception as e:  # el precalentamiento nunca debe tumbar la app
+                self.errors[name] = repr(e)
+            self.timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+        self.done.set()
+
+    def record_view(self, ms:float):
+        """Duración de la primera vista de resultados del proceso (para comparar con/sin precalentar)."""
+        if self.first_view_ms is None: self.first_view_ms = round(ms, 1)
+
+    @property
+    def state(self)->str:
+        return "pendiente" if self.thread is None else ("listo" if self.done.is_set() else "en curso")
+
+def default_tasks(plotly_figures=())->dict:
+    tasks = {}
+    if HAS_MPL: tasks["matplotlib"] = warm_matplotlib
+    if plotly_figures: tasks["plotly"] = lambda: warm_plotly(plotly_figures)
+    return tasks